@@ -5,9 +5,21 @@ Tests the available Next.js API routes
 """
 
 import requests
+import argparse
 import json
 import sys
 from datetime import datetime
+from harness import Harness, HttpTransport, InProcessTransport
+from harness.http_session import build_retry, print_connection_stats
+from harness.load_generator import ARRIVALS, LoadGenerator, print_load_report
+from harness.multiprocess_load import MultiProcessLoad, default_processes
+from harness.replay import REPLAY_CONCURRENCY, ReplayEngine, print_replay_report
+from harness.results import JsonLinesSink
+from harness.payload import PAYLOAD_BUDGET_BYTES, payload_trend, print_payload_trend
+from harness.soak import SoakTest, print_soak_report
+from harness.standin import StandInAPI, serve
+from harness.transports import IN_PROCESS_URL
+from harness.perf_history import check_against_history
 
 # Configuration
 BASE_URL = "http://localhost:3001/api"
@@ -15,38 +27,83 @@ HEADERS = {
     'Content-Type': 'application/json',
     'Accept': 'application/json'
 }
+# Unpaged endpoint whose payload grows with the status_checks collection
+STATUS_ENDPOINT = "GET /api/status"
+# Connection pool - one keep-alive pool per host, shared by every test
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+# Independent checks run concurrently, up to this many at a time
+MAX_CONCURRENCY = 4
+# Load mode defaults
+LOAD_DURATION = 30
+LOAD_CONCURRENCY = 8
+LOAD_POST_RATIO = 0.2
+LOAD_MAX_ERROR_RATE = 1.0
+# Soak mode defaults - a steady rate for hours, sampled in fixed windows
+SOAK_DURATION = 2 * 3600
+SOAK_WINDOW = 60
+SOAK_RATE = 20.0
+SOAK_CONCURRENCY = 4
+# GET /api/status items are validated as they stream in; only this many are kept for the log
+STATUS_SAMPLE_SIZE = 2
 
-class APITester:
-    def __init__(self):
-        self.test_results = []
-        self.passed = 0
-        self.failed = 0
+def validate_status_check(item):
+    """Reason a GET /api/status item is malformed, or None"""
+    if not isinstance(item, dict):
+        return f"expected object, got {type(item).__name__}"
+    if not isinstance(item.get('id'), str) or not item['id']:
+        return "missing id"
+    if item.get('client_name') in (None, '', False, 0):
+        return "missing client_name"
+    if not isinstance(item.get('timestamp'), str):
+        return "missing timestamp"
+    try:
+        datetime.fromisoformat(item['timestamp'].replace('Z', '+00:00'))
+    except ValueError:
+        return f"invalid timestamp {item['timestamp']!r}"
+    return None
+
+class APITester(Harness):
+    title = "HeadwayOS Backend API Tests"
+    suite = 'api'
+    results_file = '/app/api_test_results.json'
+    results_stream = '/app/api_test_results.jsonl'
     
-    def log_test(self, test_name, success, message, response_data=None):
-        """Log test results"""
-        status = "PASS" if success else "FAIL"
-        result = {
-            'test': test_name,
-            'status': status,
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        }
-        if response_data:
-            result['response'] = response_data
-        
-        self.test_results.append(result)
-        
-        if success:
-            self.passed += 1
-            print(f"✅ {test_name}: {message}")
-        else:
-            self.failed += 1
-            print(f"❌ {test_name}: {message}")
+    def __init__(self, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 max_retries=MAX_RETRIES, retry_backoff=RETRY_BACKOFF, max_concurrency=MAX_CONCURRENCY,
+                 results_stream=None, transport=None, base_url=BASE_URL, suite=None, server=None):
+        super().__init__(
+            transport or HttpTransport(
+                headers=HEADERS,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                retries=build_retry(total=max_retries, backoff_factor=retry_backoff)
+            ),
+            max_concurrency=max_concurrency,
+            results_stream=results_stream
+        )
+        self.base_url = base_url
+        self.target = base_url
+        if suite:
+            self.suite = suite
+        self.session = self.transport.session
+        # Stand-in HTTP server started for this tester, shut down with it
+        self.server = server
+    
+    def close(self):
+        """Close the transport, the results stream and the stand-in server"""
+        super().close()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
     
     def test_root_endpoint(self):
         """Test GET /api/root endpoint"""
         try:
-            response = requests.get(f"{BASE_URL}/root", headers=HEADERS, timeout=10)
+            response = self.session.get(f"{self.base_url}/root", timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -84,9 +141,8 @@ class APITester:
                 "client_name": "HeadwayOS_Test_Client"
             }
             
-            response = requests.post(
-                f"{BASE_URL}/status", 
-                headers=HEADERS, 
+            response = self.session.post(
+                f"{self.base_url}/status", 
                 json=test_data,
                 timeout=10
             )
@@ -137,9 +193,8 @@ class APITester:
         """Test POST /api/status endpoint validation"""
         try:
             # Test without client_name
-            response = requests.post(
-                f"{BASE_URL}/status", 
-                headers=HEADERS, 
+            response = self.session.post(
+                f"{self.base_url}/status", 
                 json={},
                 timeout=10
             )
@@ -176,29 +231,39 @@ class APITester:
     def test_status_get_endpoint(self):
         """Test GET /api/status endpoint"""
         try:
-            response = requests.get(f"{BASE_URL}/status", headers=HEADERS, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if isinstance(data, list):
-                    self.log_test(
-                        "Status GET", 
-                        True, 
-                        f"Successfully retrieved {len(data)} status checks",
-                        {"count": len(data), "sample": data[:2] if data else []}
-                    )
-                else:
+            # Streamed so items are checked as they arrive instead of building the whole list
+            with self.session.get(f"{self.base_url}/status", timeout=10, stream=True) as response:
+                if response.status_code != 200:
                     self.log_test(
                         "Status GET", 
                         False, 
-                        f"Expected array response, got: {type(data)}"
+                        f"HTTP {response.status_code}: {response.text}"
                     )
-            else:
+                    return
+                
+                stream = response.json_array(validate=validate_status_check, sample_size=STATUS_SAMPLE_SIZE)
+            
+            if not stream.is_array:
                 self.log_test(
                     "Status GET", 
                     False, 
-                    f"HTTP {response.status_code}: {response.text}"
+                    f"Expected array response, got: {type(stream.value)}"
+                )
+            elif stream.invalid:
+                first = stream.invalid_items[0]
+                self.log_test(
+                    "Status GET", 
+                    False, 
+                    f"{stream.invalid} of {stream.count} status checks malformed, "
+                    f"first at index {first['index']}: {first['reason']}",
+                    stream.summary()
+                )
+            else:
+                self.log_test(
+                    "Status GET", 
+                    True, 
+                    f"Successfully retrieved {stream.count} status checks",
+                    stream.summary()
                 )
                 
         except requests.exceptions.RequestException as e:
@@ -207,11 +272,17 @@ class APITester:
                 False, 
                 f"Request failed: {str(e)}"
             )
+        except ValueError as e:
+            self.log_test(
+                "Status GET", 
+                False, 
+                f"Invalid JSON response: {e}"
+            )
     
     def test_invalid_route(self):
         """Test invalid route handling"""
         try:
-            response = requests.get(f"{BASE_URL}/nonexistent", headers=HEADERS, timeout=10)
+            response = self.session.get(f"{self.base_url}/nonexistent", timeout=10)
             
             if response.status_code == 404:
                 data = response.json()
@@ -245,7 +316,7 @@ class APITester:
     def test_cors_headers(self):
         """Test CORS headers are present"""
         try:
-            response = requests.options(f"{BASE_URL}/status", headers=HEADERS, timeout=10)
+            response = self.session.options(f"{self.base_url}/status", timeout=10)
             
             cors_headers = [
                 'Access-Control-Allow-Origin',
@@ -276,54 +347,311 @@ class APITester:
                 f"Request failed: {str(e)}"
             )
     
-    def run_all_tests(self):
-        """Run all API tests"""
-        print("🚀 Starting HeadwayOS Backend API Tests")
-        print(f"📍 Testing against: {BASE_URL}")
+    def run_load_test(self, duration=LOAD_DURATION, concurrency=LOAD_CONCURRENCY, rate=None,
+                      post_ratio=LOAD_POST_RATIO, processes=1, arrivals=None):
+        """Drive a POST/GET mix against /api/status and return the load report"""
+        print("🚀 Starting HeadwayOS /api/status Load Test")
+        print(f"📍 Testing against: {self.base_url}")
+        target = f"{rate:.1f} req/s" if rate else "unthrottled"
+        if arrivals:
+            target += f" ({arrivals} arrivals, open model)"
+        print(f"⚙️  {duration}s, {concurrency} workers in {processes} process(es), {target}, "
+              f"{post_ratio * 100:.0f}% POST")
         print("=" * 60)
         
-        # Run tests
-        self.test_root_endpoint()
-        self.test_status_post_validation()
-        status_id = self.test_status_post_endpoint()
-        self.test_status_get_endpoint()
-        self.test_invalid_route()
-        self.test_cors_headers()
+        if processes > 1:
+            # Each process opens its own connections; the merged latency lands in this tester
+            load = MultiProcessLoad(
+                self.base_url,
+                headers=HEADERS,
+                duration=duration,
+                concurrency=concurrency,
+                rate=rate,
+                post_ratio=post_ratio,
+                processes=processes,
+                recorder=self.latency,
+                arrivals=arrivals
+            )
+            report = load.run()
+        else:
+            generator = LoadGenerator(
+                self.session,
+                self.base_url,
+                duration=duration,
+                concurrency=concurrency,
+                rate=rate,
+                post_ratio=post_ratio,
+                arrivals=arrivals
+            )
+            report = generator.run()
+            report.update(self.transport.stats())
+        report['latency'] = self.latency.summary()
         
-        # Summary
-        print("\n" + "=" * 60)
-        print("📊 TEST SUMMARY")
+        print_load_report(report)
+        if processes > 1:
+            print_connection_stats(report['connections'])
+        else:
+            self.transport.print_stats()
+        for failure in report.get('process_failures', []):
+            print(f"⚠️  Load process {failure['index']} failed: {failure['error']}")
+        return report
+    
+    def run_replay(self, capture, speed=1.0, concurrency=REPLAY_CONCURRENCY):
+        """Replay a JSON Lines traffic capture and return the replay report"""
+        print("🚀 Starting HeadwayOS Traffic Replay")
+        print(f"📍 Testing against: {self.base_url}")
+        print(f"⚙️  {capture} at {f'{speed:g}x' if speed else 'max speed'}, {concurrency} workers")
+        print("=" * 60)
+        
+        engine = ReplayEngine(self.session, self.base_url, speed=speed, concurrency=concurrency)
+        report = engine.run(capture)
+        report.update(self.transport.stats())
+        report['latency'] = self.latency.summary()
+        
+        print_replay_report(report)
+        self.transport.print_stats()
+        return report
+    
+    def run_soak_test(self, duration=SOAK_DURATION, window=SOAK_WINDOW, rate=SOAK_RATE,
+                      concurrency=SOAK_CONCURRENCY, post_ratio=LOAD_POST_RATIO, sink=None):
+        """Hold a steady POST/GET mix against /api/status and watch GET latency as the collection grows"""
+        print("🚀 Starting HeadwayOS /api/status Soak Test")
+        print(f"📍 Testing against: {self.base_url}")
+        print(f"⚙️  {duration:.0f}s in {window:.0f}s windows, {concurrency} workers, {rate:.1f} req/s, "
+              f"{post_ratio * 100:.0f}% POST")
         print("=" * 60)
-        print(f"✅ Passed: {self.passed}")
-        print(f"❌ Failed: {self.failed}")
-        print(f"📈 Success Rate: {(self.passed / (self.passed + self.failed) * 100):.1f}%")
         
-        if self.failed > 0:
-            print("\n🔍 FAILED TESTS:")
-            for result in self.test_results:
-                if result['status'] == 'FAIL':
-                    print(f"   • {result['test']}: {result['message']}")
+        soak = SoakTest(
+            self.session,
+            self.base_url,
+            duration=duration,
+            window=window,
+            rate=rate,
+            concurrency=concurrency,
+            post_ratio=post_ratio,
+            sink=sink
+        )
+        report = soak.run()
+        report.update(self.transport.stats())
+        report['latency'] = self.latency.summary()
+        
+        print_soak_report(report)
+        self.transport.print_stats()
+        return report
+    
+    def print_extra_stats(self):
+        # GET /api/status returns up to 1000 documents with no paging - watch it grow
+        print_payload_trend(STATUS_ENDPOINT, payload_trend(self.suite, STATUS_ENDPOINT))
+    
+    def register_checks(self, runner):
+        """The GET count check has to see the document the POST created"""
+        runner.discover(self, after={
+            'test_status_get_endpoint': ['test_status_post_endpoint']
+        })
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="HeadwayOS backend API tests")
+    parser.add_argument('--load', action='store_true',
+                        help="drive load against /api/status instead of the functional checks")
+    parser.add_argument('--soak', action='store_true',
+                        help="hold a steady rate against /api/status for hours and report latency drift")
+    parser.add_argument('--replay', metavar='CAPTURE', default=None,
+                        help="replay a JSON Lines capture (method, path, body, ts[, latency_ms, status] per line, "
+                             ".gz allowed) and compare latency with the captured values")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="replay speed multiplier; 0 sends as fast as the workers allow")
+    parser.add_argument('--duration', type=float, default=None,
+                        help=f"load duration in seconds (default: {LOAD_DURATION}, soak: {SOAK_DURATION})")
+    parser.add_argument('--window', type=float, default=SOAK_WINDOW,
+                        help="soak sampling window in seconds")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help=f"number of concurrent load workers (default: {LOAD_CONCURRENCY}, soak: {SOAK_CONCURRENCY}, "
+                             f"replay: {REPLAY_CONCURRENCY})")
+    parser.add_argument('--rate', type=float, default=None,
+                        help=f"target total request rate in req/s (default: unthrottled, soak: {SOAK_RATE})")
+    parser.add_argument('--arrivals', choices=ARRIVALS, default=None,
+                        help="open-model load: send at --rate on a fixed constant or Poisson schedule and "
+                             "measure latency from each intended send time")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="load processes to spread the workers over (default: one per core, "
+                             "at most one per worker; always 1 with the in-process stand-in)")
+    parser.add_argument('--post-ratio', type=float, default=LOAD_POST_RATIO,
+                        help="fraction of load requests that are POSTs")
+    parser.add_argument('--max-error-rate', type=float, default=LOAD_MAX_ERROR_RATE,
+                        help="error rate in percent above which the load run fails")
+    parser.add_argument('--payload-budget', type=int, default=PAYLOAD_BUDGET_BYTES,
+                        help="decoded response size in bytes above which a payload warning is printed")
+    parser.add_argument('--standin', nargs='?', const='inprocess', choices=['inprocess', 'http'], default=None,
+                        help="run against the in-memory API stand-in instead of localhost:3001, "
+                             "in this process (default) or behind a local HTTP server")
+    parser.add_argument('--stream', default=None,
+                        help="JSON Lines file or named pipe each result is written to as it is logged "
+                             f"(default: {APITester.results_stream})")
+    args = parser.parse_args()
+    if args.arrivals and not args.rate:
+        parser.error("--arrivals needs --rate")
+    return args
+
+def build_tester(args, **options):
+    """APITester against the dev server, or against the API stand-in with --standin"""
+    if args.standin == 'inprocess':
+        # No sockets at all - measures the harness itself
+        return APITester(
+            transport=InProcessTransport(StandInAPI(), headers=HEADERS),
+            base_url=f"{IN_PROCESS_URL}/api",
+            suite='api-standin',
+            **options
+        )
+    if args.standin == 'http':
+        server = serve()
+        return APITester(
+            base_url=f"http://127.0.0.1:{server.server_address[1]}/api",
+            suite='api-standin-http',
+            server=server,
+            **options
+        )
+    return APITester(**options)
+
+def run_load(args):
+    """Load mode execution"""
+    concurrency = args.concurrency or LOAD_CONCURRENCY
+    tester = build_tester(
+        args,
+        pool_maxsize=max(POOL_MAXSIZE, concurrency),
+        results_stream=args.stream or '/app/load_test_results.jsonl'
+    )
+    # The in-process stand-in only exists in this process
+    processes = 1 if args.standin == 'inprocess' else args.processes or default_processes(concurrency)
+    try:
+        report = tester.run_load_test(
+            duration=args.duration or LOAD_DURATION,
+            concurrency=concurrency,
+            rate=args.rate,
+            post_ratio=args.post_ratio,
+            processes=processes,
+            arrivals=args.arrivals
+        )
+        report['timestamp'] = datetime.now().isoformat()
+        
+        success = (report['requests'] > 0 and report['error_rate'] <= args.max_error_rate
+                   and not report.get('process_failures'))
+        # A run the client could not drive at full speed says nothing about the server
+        report['valid'] = not report['client_cpu']['saturated']
+        
+        # Compare throughput and latency with previous load runs
+        metrics = {}
+        for route, stats in report['routes'].items():
+            metrics[(route, 'throughput')] = stats['throughput']
+            for pct in ('p50', 'p95', 'p99'):
+                metrics[(route, f'total.{pct}_ms')] = stats[f'{pct}_ms']
+        # Corrected latencies are not comparable with closed-loop runs, so each model has its own history
+        suite = f"{tester.suite}-load-{args.arrivals}" if args.arrivals else f"{tester.suite}-load"
+        if report['valid']:
+            report['regressions'] = check_against_history(
+                suite, metrics, int(success), int(not success), tester.log_test
+            )
+        else:
+            # Kept out of the history so a client-bound run never becomes a baseline
+            print("⚠️  Client-bound run not recorded in the performance history")
+            report['regressions'] = []
+    finally:
+        # Regressions are logged as results, so the results stream closes last
+        tester.close()
+    
+    with open('/app/load_test_results.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n📄 Load results saved to: /app/load_test_results.json")
+    
+    sys.exit(0 if success and not report['regressions'] else 1)
+
+def run_soak(args):
+    """Soak mode execution"""
+    concurrency = args.concurrency or SOAK_CONCURRENCY
+    tester = build_tester(
+        args,
+        pool_maxsize=max(POOL_MAXSIZE, concurrency),
+        results_stream=args.stream or '/app/soak_test_results.jsonl'
+    )
+    # Windows are streamed as they finish, so a soak stopped early still has its data
+    sink = JsonLinesSink('/app/soak_windows.jsonl')
+    try:
+        try:
+            report = tester.run_soak_test(
+                duration=args.duration or SOAK_DURATION,
+                window=args.window,
+                rate=args.rate or SOAK_RATE,
+                concurrency=concurrency,
+                post_ratio=args.post_ratio,
+                sink=sink
+            )
+        finally:
+            sink.close()
+        report['timestamp'] = datetime.now().isoformat()
         
-        return self.failed == 0
+        drift = report['drift']
+        if drift['baseline_ms'] is not None:
+            tester.log_test(
+                "Soak Drift: GET /api/status",
+                not drift['drifted'],
+                f"p50 above {drift['limit_ms']:.1f}ms from window {drift['onset_window']}, "
+                f"~{drift['collection_at_onset']} documents" if drift['drifted']
+                else f"p50 stayed within {drift['limit_ms']:.1f}ms over {len(report['windows'])} windows",
+                drift
+            )
+    finally:
+        # The drift verdict is logged as a result, so the results stream closes last
+        tester.close()
+    error_rate = max((w['error_rate'] for w in report['windows']), default=0.0)
+    success = bool(report['windows']) and not drift['drifted'] and error_rate <= args.max_error_rate
+    
+    with open('/app/soak_test_results.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n📄 Soak results saved to: /app/soak_test_results.json (windows: /app/soak_windows.jsonl)")
+    
+    sys.exit(0 if success else 1)
+
+def run_replay(args):
+    """Replay mode execution"""
+    concurrency = args.concurrency or REPLAY_CONCURRENCY
+    tester = build_tester(
+        args,
+        pool_maxsize=max(POOL_MAXSIZE, concurrency),
+        results_stream=args.stream or '/app/replay_results.jsonl'
+    )
+    try:
+        report = tester.run_replay(args.replay, speed=args.speed, concurrency=concurrency)
+    finally:
+        tester.close()
+    report['timestamp'] = datetime.now().isoformat()
+    
+    success = report['requests'] > 0 and report['error_rate'] <= args.max_error_rate
+    
+    with open('/app/replay_results.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n📄 Replay results saved to: /app/replay_results.json")
+    
+    sys.exit(0 if success else 1)
 
 def main():
     """Main test execution"""
-    tester = APITester()
+    args = parse_args()
+    if args.replay:
+        run_replay(args)
+    if args.load:
+        run_load(args)
+    if args.soak:
+        run_soak(args)
+    
+    tester = build_tester(args, results_stream=args.stream)
+    tester.payload_budget = args.payload_budget
     success = tester.run_all_tests()
     
     # Save detailed results
-    with open('/app/api_test_results.json', 'w') as f:
-        json.dump({
-            'summary': {
-                'passed': tester.passed,
-                'failed': tester.failed,
-                'success_rate': (tester.passed / (tester.passed + tester.failed) * 100) if (tester.passed + tester.failed) > 0 else 0,
-                'timestamp': datetime.now().isoformat()
-            },
-            'tests': tester.test_results
-        }, f, indent=2)
-    
-    print(f"\n📄 Detailed results saved to: /app/api_test_results.json")
+    tester.save_results()
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
@@ -5,50 +5,111 @@ Tests the dashboard features including accessibility, API endpoints, and basic f
 """
 
 import requests
+import argparse
 import json
 import sys
 import time
 import re
 from datetime import datetime
+from harness import Harness, HttpTransport
+from harness.cold_start import ColdStartProfiler, PROFILED_ROUTES, SERVER_LOG, WARM_SAMPLES, print_cold_start_report
+from harness.page_cache import PageCache
+from harness.indicator_matcher import IndicatorRegistry
 
-class DashboardTester:
-    def __init__(self):
-        self.test_results = []
-        self.passed = 0
-        self.failed = 0
+# Independent checks run concurrently, up to this many at a time
+MAX_CONCURRENCY = 4
+
+# Indicators each check looks for in the server-rendered dashboard, matched in one scan
+INDICATORS = {
+    # Loading screen shown while mock data is missing
+    'loading': ["Loading your dashboard"],
+    # Key dashboard elements
+    'dashboard': [
+        "WELCOME BACK",
+        "HeadwayOS",
+        "Aarav",
+        "MATCH",
+        "MARKET FIT"
+    ],
+    # Mock data elements
+    'mock_data': [
+        "Aarav",  # User name
+        "Backend SWE",  # Target role
+        "San Francisco",  # City
+        "Complete API design patterns",  # Task name
+        "System design mock interview",  # Another task
+        "78%",  # ATS Score
+        "84%"   # Market Fit
+    ],
+    # Interactive element indicators
+    'interactive': [
+        'cursor-pointer',  # Clickable elements
+        'onClick',  # Click handlers
+        'hover:',  # Hover effects
+        'transition',  # Animations
+        'button'  # Button elements
+    ],
+    # Task management elements
+    'task': [
+        "Complete API design patterns",
+        "System design mock interview",
+        "Database optimization project",
+        "Add Task",
+        "Edit",
+        "hours"
+    ],
+    # Navigation elements
+    'nav': ["Home", "Resume", "Roadmap", "Modules", "Jobs", "Calendar", "Insights", "Settings"],
+    # Theme system indicators
+    'theme': [
+        'class="dark"',  # Dark mode class
+        'bg-black',  # Dark background
+        'text-white',  # White text
+        'ThemeToggle',  # Theme toggle component
+        'theme-provider'  # Theme provider
+    ],
+    # Progress indicators
+    'progress': [
+        "Readiness",
+        "Coverage",
+        "Weekly Progress",
+        "%",  # Percentage indicators
+        "progress",  # Progress elements
+        "CircularProgress"  # Circular progress component
+    ]
+}
+
+class DashboardTester(Harness):
+    title = "HeadwayOS Dashboard Functionality Tests"
+    suite = 'dashboard-html'
+    results_file = '/app/dashboard_test_results.json'
+    results_stream = '/app/dashboard_test_results.jsonl'
+    
+    def __init__(self, max_concurrency=MAX_CONCURRENCY):
+        super().__init__(HttpTransport(), max_concurrency=max_concurrency)
         self.base_url = "http://localhost:3001"
+        self.target = f"{self.base_url}/dashboard"
+        self.session = self.transport.session
+        # Every check reads the same server-rendered page, so it is fetched once
+        self.pages = PageCache(self.session)
+        self.indicators = IndicatorRegistry()
+        for group, indicators in INDICATORS.items():
+            self.indicators.register(group, indicators)
         
-    def log_test(self, test_name, success, message, response_data=None):
-        """Log test results"""
-        status = "PASS" if success else "FAIL"
-        result = {
-            'test': test_name,
-            'status': status,
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        }
-        if response_data:
-            result['response'] = response_data
-        
-        self.test_results.append(result)
-        
-        if success:
-            self.passed += 1
-            print(f"✅ {test_name}: {message}")
-        else:
-            self.failed += 1
-            print(f"❌ {test_name}: {message}")
+    def scan_page(self, snapshot):
+        """Match every registered indicator against a page snapshot in one pass"""
+        return snapshot.derived('indicators', lambda: self.indicators.scan(snapshot.text))
     
     def test_dashboard_accessibility(self):
         """Test that dashboard page is accessible and returns valid HTML"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
+                scan = self.scan_page(response)
                 
                 # Check if it's not showing loading screen
-                if "Loading your dashboard" in html_content:
+                if scan.found('loading'):
                     self.log_test(
                         "Dashboard Accessibility", 
                         False, 
@@ -56,32 +117,22 @@ class DashboardTester:
                     )
                     return False
                 
-                # Check for key dashboard elements
-                dashboard_indicators = [
-                    "WELCOME BACK",
-                    "HeadwayOS", 
-                    "Aarav",
-                    "MATCH",
-                    "MARKET FIT"
-                ]
-                
-                found_indicators = 0
-                for indicator in dashboard_indicators:
-                    if indicator in html_content:
-                        found_indicators += 1
+                found_indicators = len(scan.found('dashboard'))
                 
                 if found_indicators >= 3:
                     self.log_test(
                         "Dashboard Accessibility", 
                         True, 
-                        f"Dashboard accessible and contains expected elements - found {found_indicators}/5 key indicators"
+                        f"Dashboard accessible and contains expected elements - found {found_indicators}/5 key indicators",
+                        scan.group_summary('dashboard')
                     )
                     return True
                 else:
                     self.log_test(
                         "Dashboard Accessibility", 
                         False, 
-                        f"Dashboard missing key elements - only found {found_indicators}/5 indicators"
+                        f"Dashboard missing key elements - only found {found_indicators}/5 indicators",
+                        scan.group_summary('dashboard')
                     )
                     return False
             else:
@@ -103,39 +154,27 @@ class DashboardTester:
     def test_mock_data_integration(self):
         """Test that mock data is properly integrated in the HTML"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
-                
-                # Check for mock data elements
-                mock_data_indicators = [
-                    "Aarav",  # User name
-                    "Backend SWE",  # Target role
-                    "San Francisco",  # City
-                    "Complete API design patterns",  # Task name
-                    "System design mock interview",  # Another task
-                    "78%",  # ATS Score
-                    "84%"   # Market Fit
-                ]
+                scan = self.scan_page(response)
                 
-                found_data = 0
-                for indicator in mock_data_indicators:
-                    if indicator in html_content:
-                        found_data += 1
+                found_data = len(scan.found('mock_data'))
                 
                 if found_data >= 4:
                     self.log_test(
                         "Mock Data Integration", 
                         True, 
-                        f"Mock data properly integrated - found {found_data}/7 data elements"
+                        f"Mock data properly integrated - found {found_data}/7 data elements",
+                        scan.group_summary('mock_data')
                     )
                     return True
                 else:
                     self.log_test(
                         "Mock Data Integration", 
                         False, 
-                        f"Insufficient mock data found - only {found_data}/7 elements"
+                        f"Insufficient mock data found - only {found_data}/7 elements",
+                        scan.group_summary('mock_data')
                     )
                     return False
             else:
@@ -157,11 +196,9 @@ class DashboardTester:
     def test_metric_cards_structure(self):
         """Test that metric cards are properly structured in HTML"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
-                
                 # Check for metric card structure
                 metric_patterns = [
                     r'MATCH.*?%',  # Match percentage
@@ -172,7 +209,7 @@ class DashboardTester:
                 
                 found_metrics = 0
                 for pattern in metric_patterns:
-                    if re.search(pattern, html_content, re.IGNORECASE | re.DOTALL):
+                    if re.search(pattern, response.text, re.IGNORECASE | re.DOTALL):
                         found_metrics += 1
                 
                 if found_metrics >= 3:
@@ -208,37 +245,27 @@ class DashboardTester:
     def test_interactive_elements(self):
         """Test that interactive elements are present in HTML"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
-                
-                # Check for interactive element indicators
-                interactive_indicators = [
-                    'cursor-pointer',  # Clickable elements
-                    'onClick',  # Click handlers
-                    'hover:',  # Hover effects
-                    'transition',  # Animations
-                    'button'  # Button elements
-                ]
+                scan = self.scan_page(response)
                 
-                found_interactive = 0
-                for indicator in interactive_indicators:
-                    if indicator in html_content:
-                        found_interactive += 1
+                found_interactive = len(scan.found('interactive'))
                 
                 if found_interactive >= 3:
                     self.log_test(
                         "Interactive Elements", 
                         True, 
-                        f"Interactive elements present - found {found_interactive}/5 interaction indicators"
+                        f"Interactive elements present - found {found_interactive}/5 interaction indicators",
+                        scan.group_summary('interactive')
                     )
                     return True
                 else:
                     self.log_test(
                         "Interactive Elements", 
                         False, 
-                        f"Limited interactive elements - only {found_interactive}/5 indicators found"
+                        f"Limited interactive elements - only {found_interactive}/5 indicators found",
+                        scan.group_summary('interactive')
                     )
                     return False
             else:
@@ -260,38 +287,27 @@ class DashboardTester:
     def test_task_management_structure(self):
         """Test that task management elements are present"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
-                
-                # Check for task management elements
-                task_indicators = [
-                    "Complete API design patterns",
-                    "System design mock interview", 
-                    "Database optimization project",
-                    "Add Task",
-                    "Edit",
-                    "hours"
-                ]
+                scan = self.scan_page(response)
                 
-                found_tasks = 0
-                for indicator in task_indicators:
-                    if indicator in html_content:
-                        found_tasks += 1
+                found_tasks = len(scan.found('task'))
                 
                 if found_tasks >= 4:
                     self.log_test(
                         "Task Management Structure", 
                         True, 
-                        f"Task management elements present - found {found_tasks}/6 task indicators"
+                        f"Task management elements present - found {found_tasks}/6 task indicators",
+                        scan.group_summary('task')
                     )
                     return True
                 else:
                     self.log_test(
                         "Task Management Structure", 
                         False, 
-                        f"Limited task management elements - only {found_tasks}/6 indicators found"
+                        f"Limited task management elements - only {found_tasks}/6 indicators found",
+                        scan.group_summary('task')
                     )
                     return False
             else:
@@ -313,31 +329,27 @@ class DashboardTester:
     def test_sidebar_navigation(self):
         """Test that sidebar navigation elements are present"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
-                
-                # Check for navigation elements
-                nav_items = ["Home", "Resume", "Roadmap", "Modules", "Jobs", "Calendar", "Insights", "Settings"]
-                found_nav = 0
+                scan = self.scan_page(response)
                 
-                for item in nav_items:
-                    if item in html_content:
-                        found_nav += 1
+                found_nav = len(scan.found('nav'))
                 
                 if found_nav >= 6:
                     self.log_test(
                         "Sidebar Navigation", 
                         True, 
-                        f"Navigation sidebar present - found {found_nav}/8 navigation items"
+                        f"Navigation sidebar present - found {found_nav}/8 navigation items",
+                        scan.group_summary('nav')
                     )
                     return True
                 else:
                     self.log_test(
                         "Sidebar Navigation", 
                         False, 
-                        f"Limited navigation items - only {found_nav}/8 items found"
+                        f"Limited navigation items - only {found_nav}/8 items found",
+                        scan.group_summary('nav')
                     )
                     return False
             else:
@@ -359,37 +371,27 @@ class DashboardTester:
     def test_theme_system(self):
         """Test that theme system is implemented"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
-                
-                # Check for theme system indicators
-                theme_indicators = [
-                    'class="dark"',  # Dark mode class
-                    'bg-black',  # Dark background
-                    'text-white',  # White text
-                    'ThemeToggle',  # Theme toggle component
-                    'theme-provider'  # Theme provider
-                ]
+                scan = self.scan_page(response)
                 
-                found_theme = 0
-                for indicator in theme_indicators:
-                    if indicator in html_content:
-                        found_theme += 1
+                found_theme = len(scan.found('theme'))
                 
                 if found_theme >= 3:
                     self.log_test(
                         "Theme System", 
                         True, 
-                        f"Theme system implemented - found {found_theme}/5 theme indicators"
+                        f"Theme system implemented - found {found_theme}/5 theme indicators",
+                        scan.group_summary('theme')
                     )
                     return True
                 else:
                     self.log_test(
                         "Theme System", 
                         False, 
-                        f"Limited theme implementation - only {found_theme}/5 indicators found"
+                        f"Limited theme implementation - only {found_theme}/5 indicators found",
+                        scan.group_summary('theme')
                     )
                     return False
             else:
@@ -411,38 +413,27 @@ class DashboardTester:
     def test_progress_indicators(self):
         """Test that progress tracking elements are present"""
         try:
-            response = requests.get(f"{self.base_url}/dashboard", timeout=10)
+            response = self.pages.get(f"{self.base_url}/dashboard")
             
             if response.status_code == 200:
-                html_content = response.text
+                scan = self.scan_page(response)
                 
-                # Check for progress indicators
-                progress_indicators = [
-                    "Readiness",
-                    "Coverage", 
-                    "Weekly Progress",
-                    "%",  # Percentage indicators
-                    "progress",  # Progress elements
-                    "CircularProgress"  # Circular progress component
-                ]
-                
-                found_progress = 0
-                for indicator in progress_indicators:
-                    if indicator in html_content:
-                        found_progress += 1
+                found_progress = len(scan.found('progress'))
                 
                 if found_progress >= 4:
                     self.log_test(
                         "Progress Indicators", 
                         True, 
-                        f"Progress tracking present - found {found_progress}/6 progress indicators"
+                        f"Progress tracking present - found {found_progress}/6 progress indicators",
+                        scan.group_summary('progress')
                     )
                     return True
                 else:
                     self.log_test(
                         "Progress Indicators", 
                         False, 
-                        f"Limited progress tracking - only {found_progress}/6 indicators found"
+                        f"Limited progress tracking - only {found_progress}/6 indicators found",
+                        scan.group_summary('progress')
                     )
                     return False
             else:
@@ -465,7 +456,7 @@ class DashboardTester:
         """Test that backend API is working and accessible from dashboard context"""
         try:
             # Test the API endpoints that the dashboard might use
-            api_response = requests.get(f"{self.base_url}/api/root", timeout=10)
+            api_response = self.session.get(f"{self.base_url}/api/root", timeout=10)
             
             if api_response.status_code == 200:
                 api_data = api_response.json()
@@ -499,57 +490,82 @@ class DashboardTester:
             )
             return False
     
-    def run_all_tests(self):
-        """Run all dashboard tests"""
-        print("🚀 Starting HeadwayOS Dashboard Functionality Tests")
-        print(f"📍 Testing against: {self.base_url}/dashboard")
-        print("=" * 60)
-        
-        # Run tests in order
-        self.test_dashboard_accessibility()
-        self.test_mock_data_integration()
-        self.test_metric_cards_structure()
-        self.test_interactive_elements()
-        self.test_task_management_structure()
-        self.test_sidebar_navigation()
-        self.test_theme_system()
-        self.test_progress_indicators()
-        self.test_api_backend_integration()
-        
-        # Summary
-        print("\n" + "=" * 60)
-        print("📊 TEST SUMMARY")
+    def run_cold_start_profile(self, restart_cmd=None, log_path=SERVER_LOG, warm_samples=WARM_SAMPLES):
+        """First-hit versus warmed latency for each page and API route"""
+        print("🚀 Starting HeadwayOS Cold Start Profile")
+        print(f"📍 Testing against: {self.base_url}")
+        print(f"⚙️  routes {', '.join(PROFILED_ROUTES)}, {warm_samples} warm hits each, "
+              f"{'restart: ' + restart_cmd if restart_cmd else 'no restart'}")
         print("=" * 60)
-        print(f"✅ Passed: {self.passed}")
-        print(f"❌ Failed: {self.failed}")
-        print(f"📈 Success Rate: {(self.passed / (self.passed + self.failed) * 100):.1f}%")
         
-        if self.failed > 0:
-            print("\n🔍 FAILED TESTS:")
-            for result in self.test_results:
-                if result['status'] == 'FAIL':
-                    print(f"   • {result['test']}: {result['message']}")
+        profiler = ColdStartProfiler(
+            self.session,
+            self.base_url,
+            log_path=log_path,
+            restart_cmd=restart_cmd,
+            warm_samples=warm_samples
+        )
+        report = profiler.run()
+        for route in report['routes']:
+            self.log_test(
+                f"Cold Start: {route['route']}",
+                route['status'] < 500,
+                f"HTTP {route['status']}, first hit {route['first_hit_ms']:.0f}ms "
+                f"({'cold' if route['cold'] else 'warm'})"
+            )
+        report['latency'] = self.latency.summary()
         
-        return self.failed == 0
+        print_cold_start_report(report)
+        return report
+    
+    def print_extra_stats(self):
+        self.pages.print_stats()
+    
+    def summary_extras(self):
+        return {'page_cache': self.pages.stats}
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="HeadwayOS dashboard tests")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="profile first-hit versus warmed latency per route instead of the checks")
+    parser.add_argument('--restart-cmd', default=None,
+                        help="shell command that restarts the dev server so every route starts cold")
+    parser.add_argument('--server-log', default=SERVER_LOG,
+                        help="next dev log to read compile and render times from")
+    parser.add_argument('--samples', type=int, default=WARM_SAMPLES,
+                        help="warm hits per route for the steady state")
+    return parser.parse_args()
+
+def run_cold_start(args):
+    """Cold start profile execution"""
+    tester = DashboardTester()
+    report = tester.run_cold_start_profile(
+        restart_cmd=args.restart_cmd,
+        log_path=args.server_log,
+        warm_samples=args.samples
+    )
+    report['timestamp'] = datetime.now().isoformat()
+    tester.close()
+    
+    with open('/app/cold_start_results.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n📄 Cold start results saved to: /app/cold_start_results.json")
+    
+    sys.exit(0 if tester.failed == 0 else 1)
 
 def main():
     """Main test execution"""
+    args = parse_args()
+    if args.cold_start:
+        run_cold_start(args)
+    
     tester = DashboardTester()
     success = tester.run_all_tests()
     
     # Save detailed results
-    with open('/app/dashboard_test_results.json', 'w') as f:
-        json.dump({
-            'summary': {
-                'passed': tester.passed,
-                'failed': tester.failed,
-                'success_rate': (tester.passed / (tester.passed + tester.failed) * 100) if (tester.passed + tester.failed) > 0 else 0,
-                'timestamp': datetime.now().isoformat()
-            },
-            'tests': tester.test_results
-        }, f, indent=2)
-    
-    print(f"\n📄 Detailed results saved to: /app/dashboard_test_results.json")
+    tester.save_results()
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
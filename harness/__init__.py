@@ -0,0 +1,28 @@
+"""
+Shared harness for the HeadwayOS test suites
+
+Selenium-only helpers (harness.waits) are imported from their module so the
+HTTP suites run without Selenium installed.
+"""
+
+from .async_runner import AsyncTestRunner
+from .core import Harness
+from .latency import LatencyHistogram, LatencyRecorder
+from .results import CheckResult, JsonLinesSink, ResultLog
+from .standin import StandInAPI
+from .transports import HttpTransport, InProcessAdapter, InProcessTransport, WebDriverTransport
+
+__all__ = [
+    'AsyncTestRunner',
+    'CheckResult',
+    'Harness',
+    'HttpTransport',
+    'InProcessAdapter',
+    'InProcessTransport',
+    'JsonLinesSink',
+    'LatencyHistogram',
+    'LatencyRecorder',
+    'ResultLog',
+    'StandInAPI',
+    'WebDriverTransport',
+]
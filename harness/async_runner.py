@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Concurrent runner for the HeadwayOS test suites
+Runs independent blocking checks on worker threads under an asyncio scheduler
+"""
+
+import asyncio
+
+MAX_CONCURRENCY = 4
+
+
+class CheckEntry:
+    """A registered check and the checks it has to wait for"""
+
+    def __init__(self, name, func, after):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+
+
+class AsyncTestRunner:
+    """Run registered checks concurrently, bounded by max_concurrency.
+
+    Checks are plain blocking callables; each one runs in a worker thread once
+    every check named in its ``after`` list has finished. Ordering is the only
+    thing a dependency guarantees - a failing check does not skip its dependents,
+    matching how the suites behaved when run one after another.
+    """
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, on_error=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.on_error = on_error
+        self.entries = {}
+
+    def add(self, func, name=None, after=()):
+        """Register a single check"""
+        name = name or func.__name__
+        if name in self.entries:
+            raise ValueError(f"Check already registered: {name}")
+        self.entries[name] = CheckEntry(name, func, after)
+        return func
+
+    def discover(self, tester, prefix='test_', after=None, sequential=False, wrap=None):
+        """Register every ``test_*`` method of tester in definition order.
+
+        after maps a method name to the method names it must run after. With
+        sequential each check also waits for the one defined before it, for
+        suites that share a single stateful resource. wrap(name, method), when
+        given, returns the callable that is registered in place of the method.
+        """
+        after = after or {}
+        previous = None
+        for name in self._method_names(type(tester), prefix):
+            deps = list(after.get(name, ()))
+            if sequential and previous:
+                deps.append(previous)
+            check = getattr(tester, name)
+            if wrap:
+                check = wrap(name, check)
+            self.add(check, name=name, after=deps)
+            previous = name
+
+    @staticmethod
+    def _method_names(cls, prefix):
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if name.startswith(prefix) and callable(value) and name not in names:
+                    names.append(name)
+        return names
+
+    def _ordered(self):
+        """Topologically sort the entries, keeping registration order where free"""
+        ordered = []
+        done = set()
+        pending = list(self.entries.values())
+        while pending:
+            ready = [entry for entry in pending if all(dep in done for dep in entry.after)]
+            if not ready:
+                unknown = {dep for entry in pending for dep in entry.after if dep not in self.entries}
+                if unknown:
+                    raise ValueError(f"Unknown dependencies: {sorted(unknown)}")
+                raise ValueError(f"Dependency cycle between: {[entry.name for entry in pending]}")
+            for entry in ready:
+                ordered.append(entry)
+                done.add(entry.name)
+            pending = [entry for entry in pending if entry.name not in done]
+        return ordered
+
+    async def _run_entry(self, entry, semaphore, tasks):
+        if entry.after:
+            await asyncio.gather(*(tasks[dep] for dep in entry.after))
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(entry.func)
+            except Exception as e:
+                if self.on_error is None:
+                    raise
+                self.on_error(entry.name, e)
+                return None
+
+    async def _run_all(self):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = {}
+        for entry in self._ordered():
+            tasks[entry.name] = asyncio.create_task(self._run_entry(entry, semaphore, tasks))
+        values = await asyncio.gather(*tasks.values())
+        return dict(zip(tasks.keys(), values))
+
+    def run(self):
+        """Run every registered check and return their return values by name"""
+        return asyncio.run(self._run_all())
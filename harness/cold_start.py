@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Cold-start profiling for the HeadwayOS Next.js routes
+Separates on-demand compilation, first render and warmed steady-state latency per route
+"""
+
+import os
+import re
+import socket
+import subprocess
+import time
+from urllib.parse import urlsplit
+
+from .latency import LatencyHistogram
+
+SERVER_LOG = '/app/server.log'
+PROFILED_ROUTES = ('/', '/dashboard', '/api/root', '/api/status')
+WARM_SAMPLES = 20
+READY_TIMEOUT = 180
+# next dev writes its log lines shortly after the response goes out
+LOG_SETTLE = 0.5
+
+COMPILING_RE = re.compile(r'○ Compiling (\S+) \.\.\.')
+COMPILED_RE = re.compile(r'✓ Compiled(?: (\S+))? in ([\d.]+)(ms|s)(?: \((\d+) modules\))?')
+READY_RE = re.compile(r'✓ Ready in ([\d.]+)(ms|s)')
+REQUEST_RE = re.compile(r'\b(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS) (\S+) (\d{3}) in (\d+)ms')
+
+
+def _to_ms(value, unit):
+    return float(value) * (1000 if unit == 's' else 1)
+
+
+def parse_log_line(line):
+    """Turn one next dev log line into an event dict, or None for anything else"""
+    match = COMPILED_RE.search(line)
+    if match:
+        route, value, unit, modules = match.groups()
+        return {
+            'event': 'compiled',
+            # Without a route it is a hot-reload recompile
+            'route': route,
+            'ms': _to_ms(value, unit),
+            'modules': int(modules) if modules else None
+        }
+    match = COMPILING_RE.search(line)
+    if match:
+        return {'event': 'compiling', 'route': match.group(1)}
+    match = REQUEST_RE.search(line)
+    if match:
+        method, path, status, ms = match.groups()
+        return {'event': 'request', 'method': method, 'route': path.split('?', 1)[0],
+                'status': int(status), 'ms': float(ms)}
+    match = READY_RE.search(line)
+    if match:
+        return {'event': 'ready', 'ms': _to_ms(*match.groups())}
+    return None
+
+
+def summarize_log(path=SERVER_LOG):
+    """Compile and request timings found anywhere in the server log"""
+    summary = {'ready_ms': [], 'route_compiles': {}, 'recompiles': LatencyHistogram(), 'first_requests': {}}
+    if not os.path.exists(path):
+        return None
+
+    with open(path, errors='replace') as f:
+        for line in f:
+            event = parse_log_line(line)
+            if not event:
+                continue
+            if event['event'] == 'ready':
+                summary['ready_ms'].append(event['ms'])
+            elif event['event'] == 'compiled' and event['route']:
+                summary['route_compiles'].setdefault(event['route'], []).append(
+                    {'ms': event['ms'], 'modules': event['modules']}
+                )
+            elif event['event'] == 'compiled':
+                summary['recompiles'].record(event['ms'])
+            elif event['event'] == 'request':
+                summary['first_requests'].setdefault(event['route'], event['ms'])
+
+    recompiles = summary['recompiles']
+    summary['recompiles'] = {
+        'count': recompiles.count,
+        'p50_ms': recompiles.percentile(50),
+        'max_ms': recompiles.max
+    }
+    return summary
+
+
+class LogTail:
+    """Lines appended to the server log since the last read"""
+
+    def __init__(self, path=SERVER_LOG):
+        self.path = path
+        self.offset = self._size()
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def mark(self):
+        self.offset = self._size()
+
+    def read(self):
+        """Events written since the last mark or read"""
+        size = self._size()
+        if size < self.offset:
+            # The log was truncated by a restart
+            self.offset = 0
+        if size == self.offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset = size
+        events = []
+        for line in data.decode(errors='replace').splitlines():
+            event = parse_log_line(line)
+            if event:
+                events.append(event)
+        return events
+
+
+class ColdStartProfiler:
+    """First-hit versus steady-state latency for each route.
+
+    With restart_cmd the server is restarted first, so every route starts
+    cold; otherwise a route counts as cold only if the server log shows it
+    being compiled on the first hit. The first hit of each route is split into
+    compile time (from the log), server render time (the log's "GET ... in Nms")
+    and the rest; warm_samples further hits give the steady state.
+    """
+
+    def __init__(self, session, base_url, routes=PROFILED_ROUTES, log_path=SERVER_LOG, restart_cmd=None,
+                 warm_samples=WARM_SAMPLES, ready_timeout=READY_TIMEOUT, timeout=120):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.routes = routes
+        self.log_path = log_path
+        self.restart_cmd = restart_cmd
+        self.warm_samples = warm_samples
+        self.ready_timeout = ready_timeout
+        self.timeout = timeout
+        self.tail = LogTail(log_path)
+
+    def _listening(self):
+        parts = urlsplit(self.base_url)
+        try:
+            with socket.create_connection((parts.hostname, parts.port or 80), timeout=2):
+                return True
+        except OSError:
+            return False
+
+    def restart(self):
+        """Run the restart command and wait until the server is ready.
+
+        No HTTP request is sent while waiting - any page request would compile
+        a route before it is profiled. Ready means the port accepts connections
+        and, when there is a log, next dev has logged "Ready in".
+        """
+        self.tail.mark()
+        start = time.perf_counter()
+        subprocess.run(self.restart_cmd, shell=True, check=True)
+        ready = not os.path.exists(self.log_path)
+        deadline = start + self.ready_timeout
+        while time.perf_counter() < deadline:
+            ready = ready or any(e['event'] == 'ready' for e in self.tail.read())
+            if ready and self._listening():
+                return (time.perf_counter() - start) * 1000
+            time.sleep(0.2)
+        raise TimeoutError(f"Server not ready {self.ready_timeout}s after restart")
+
+    def _hit(self, route):
+        start = time.perf_counter()
+        response = self.session.get(f"{self.base_url}{route}", timeout=self.timeout)
+        response.content
+        return (time.perf_counter() - start) * 1000, response
+
+    def profile_route(self, route):
+        self.tail.mark()
+        first_ms, response = self._hit(route)
+        time.sleep(LOG_SETTLE)
+        events = self.tail.read()
+
+        compiles = [e for e in events if e['event'] == 'compiled']
+        server_ms = next((e['ms'] for e in events if e['event'] == 'request' and e['route'] == route), None)
+        compile_ms = sum(e['ms'] for e in compiles) if compiles else None
+
+        steady = LatencyHistogram()
+        for _ in range(self.warm_samples):
+            ms, _ = self._hit(route)
+            steady.record(ms)
+        steady_p50 = steady.percentile(50)
+
+        return {
+            'route': route,
+            'status': response.status_code,
+            # Without a log only a restart tells us the route started cold
+            'cold': bool(compiles) if os.path.exists(self.log_path) else bool(self.restart_cmd),
+            'first_hit_ms': first_ms,
+            'first_ttfb_ms': response.elapsed.total_seconds() * 1000,
+            'compile_ms': compile_ms,
+            'compiled': [e['route'] for e in compiles],
+            'modules': sum(e['modules'] or 0 for e in compiles) if compiles else None,
+            'first_render_ms': server_ms,
+            'steady': steady.to_dict(),
+            'cold_penalty_ms': first_ms - steady_p50 if steady.count else None
+        }
+
+    def run(self):
+        """Profile every route in order and return the report"""
+        restart_ms = self.restart() if self.restart_cmd else None
+        routes = [self.profile_route(route) for route in self.routes]
+        return {
+            'restarted': bool(self.restart_cmd),
+            'restart_ms': restart_ms,
+            'log': self.log_path if os.path.exists(self.log_path) else None,
+            'routes': routes,
+            'server_log': summarize_log(self.log_path)
+        }
+
+
+def print_cold_start_report(report):
+    """Print a cold-start report in the suite summary format"""
+    print("\n" + "=" * 60)
+    print("🧊 COLD START PROFILE")
+    print("=" * 60)
+    if report['restarted']:
+        print(f"🔄 Restart to first response: {report['restart_ms']:.0f}ms")
+    if not report['log']:
+        print("⚠️  No server log - compile and render times unavailable")
+
+    for route in report['routes']:
+        state = "cold" if route['cold'] else "already warm"
+        print(f"\n   {route['route']} ({state}, HTTP {route['status']})")
+        parts = [f"first hit {route['first_hit_ms']:.0f}ms"]
+        if route['compile_ms'] is not None:
+            modules = f", {route['modules']} modules" if route['modules'] else ""
+            parts.append(f"compile {route['compile_ms']:.0f}ms{modules}")
+        if route['first_render_ms'] is not None:
+            parts.append(f"first render {route['first_render_ms']:.0f}ms")
+        print(f"      {', '.join(parts)}")
+        steady = route['steady']
+        if steady['count']:
+            print(f"      steady p50 {steady['p50_ms']:.1f}ms p90 {steady['p90_ms']:.1f}ms "
+                  f"({steady['count']} hits), cold penalty {route['cold_penalty_ms']:.0f}ms")
+
+    log = report['server_log']
+    if log:
+        print("\n📜 Server log:")
+        for route, compiles in log['route_compiles'].items():
+            times = ", ".join(f"{c['ms']:.0f}ms" for c in compiles)
+            print(f"   • {route}: compiled {len(compiles)}x ({times})")
+        if log['recompiles']['count']:
+            print(f"   • hot reloads: {log['recompiles']['count']}x, "
+                  f"p50 {log['recompiles']['p50_ms']:.0f}ms, max {log['recompiles']['max_ms']:.0f}ms")
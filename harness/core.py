@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Base class of the HeadwayOS test suites
+Result logging, concurrent check execution, run history and reporting in one place
+"""
+
+import json
+from datetime import datetime
+
+from .async_runner import MAX_CONCURRENCY, AsyncTestRunner
+from .latency import print_latency_summary
+from .payload import PAYLOAD_BUDGET_BYTES, flatten_payload, over_budget, print_payload_summary
+from .perf_history import check_against_history, flatten_latency
+from .results import CheckResult, JsonLinesSink, ResultLog
+
+
+class Harness:
+    """A suite of ``test_*`` checks run against one transport.
+
+    Subclasses set title, target, suite (the run history key), results_file and
+    results_stream (JSON Lines, one result per line), and may override setup,
+    register_checks, print_extra_stats and summary_extras. Every call made
+    through the transport is timed into transport.latency, which feeds the
+    summary, the JSON report and the history.
+    """
+
+    title = "HeadwayOS Tests"
+    target = ""
+    suite = None
+    results_file = None
+    results_stream = None
+    payload_budget = PAYLOAD_BUDGET_BYTES
+
+    def __init__(self, transport, max_concurrency=MAX_CONCURRENCY, results_stream=None):
+        self.transport = transport
+        self.max_concurrency = max_concurrency
+        if results_stream:
+            self.results_stream = results_stream
+        self.results = ResultLog(JsonLinesSink(self.results_stream) if self.results_stream else None)
+        self.regressions = []
+
+    @property
+    def latency(self):
+        return self.transport.latency
+
+    @property
+    def passed(self):
+        return self.results.passed
+
+    @property
+    def failed(self):
+        return self.results.failed
+
+    @property
+    def test_results(self):
+        return self.results.to_list()
+
+    def log_test(self, test_name, success, message, response_data=None):
+        """Log test results"""
+        self.results.add(CheckResult(test_name, success, message, response_data))
+
+    def log_error(self, check_name, error):
+        """Log a check that raised instead of reporting its own result"""
+        self.log_test(check_name, False, f"Unexpected error: {type(error).__name__}: {error}")
+
+    def setup(self):
+        """Prepare the transport; returning False aborts the run"""
+        return True
+
+    def teardown(self):
+        """Release the transport once every check has run"""
+        self.close()
+
+    def close(self):
+        """Close the transport and the results stream"""
+        self.transport.close()
+        self.results.close()
+
+    def register_checks(self, runner):
+        """Register the suite's checks; by default every one may run side by side"""
+        runner.discover(self)
+
+    def history_metrics(self):
+        metrics = flatten_latency(self.latency.summary())
+        if self.transport.payload is not None:
+            metrics.update(flatten_payload(self.transport.payload.summary()))
+        return metrics
+
+    def run_all_tests(self):
+        """Run every check, compare with run history and print the summary"""
+        print(f"🚀 Starting {self.title}")
+        print(f"📍 Testing against: {self.target}")
+        print("=" * 60)
+
+        if not self.setup():
+            return False
+
+        try:
+            runner = AsyncTestRunner(max_concurrency=self.max_concurrency, on_error=self.log_error)
+            self.register_checks(runner)
+            runner.run()
+        finally:
+            self.teardown()
+
+        # Compare latency with previous runs - a significant slowdown fails the run
+        if self.suite:
+            self.regressions = check_against_history(
+                self.suite, self.history_metrics(), self.passed, self.failed, self.log_test
+            )
+
+        self.print_summary()
+        self.results.close()
+        return self.failed == 0
+
+    def print_extra_stats(self):
+        """Suite-specific lines printed after the latency and payload statistics"""
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("📊 TEST SUMMARY")
+        print("=" * 60)
+        print(f"✅ Passed: {self.passed}")
+        print(f"❌ Failed: {self.failed}")
+        print(f"📈 Success Rate: {self.results.success_rate:.1f}%")
+        self.transport.print_stats()
+        print_latency_summary(self.latency.summary())
+        if self.transport.payload is not None:
+            print_payload_summary(self.transport.payload.summary(), self.payload_budget)
+        self.print_extra_stats()
+
+        if self.failed > 0:
+            print("\n🔍 FAILED TESTS:")
+            failures = self.results.failures()
+            if self.failed > len(failures):
+                print(f"   … {self.failed - len(failures)} earlier failure(s), see {self.results_stream}")
+            for result in failures:
+                print(f"   • {result.test}: {result.message}")
+
+    def summary_extras(self):
+        """Suite-specific entries for the JSON summary"""
+        return {}
+
+    def report(self):
+        """Full results as a JSON-serialisable dict"""
+        summary = {
+            'passed': self.passed,
+            'failed': self.failed,
+            'success_rate': self.results.success_rate
+        }
+        summary.update(self.transport.stats())
+        summary.update(self.summary_extras())
+        if self.results_stream:
+            # tests only holds the most recent results once a run outgrows the buffer
+            summary['results_stream'] = self.results_stream
+            summary['tests_truncated'] = self.results.truncated
+        summary['timestamp'] = datetime.now().isoformat()
+        report = {
+            'summary': summary,
+            'tests': self.test_results,
+            'regressions': self.regressions,
+            'latency': self.latency.summary()
+        }
+        if self.transport.payload is not None:
+            payload = self.transport.payload.summary()
+            report['payload'] = payload
+            report['payload_warnings'] = over_budget(payload, self.payload_budget)
+        return report
+
+    def save_results(self, path=None):
+        """Write the detailed results file"""
+        path = path or self.results_file
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+        print(f"\n📄 Detailed results saved to: {path}")
+        return path
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Batched DOM queries for the HeadwayOS browser suites
+Evaluates many text, selector and localStorage lookups in one WebDriver round trip
+"""
+
+PROBE_SCRIPT = """
+var queries = arguments[0];
+var result = {values: {}, errors: {}};
+queries.forEach(function (query) {
+    try {
+        var value;
+        if (query.type === 'xpath') {
+            value = document.evaluate(query.expr, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+        } else if (query.type === 'selector') {
+            value = document.querySelectorAll(query.expr).length;
+        } else if (query.type === 'attribute') {
+            var element = document.querySelector(query.expr);
+            value = element ? element.getAttribute(query.attr) : null;
+        } else if (query.type === 'localStorage') {
+            value = window.localStorage.getItem(query.expr);
+        }
+        result.values[query.name] = value;
+    } catch (e) {
+        result.errors[query.name] = String(e);
+    }
+});
+return result;
+"""
+
+
+class ProbeError(Exception):
+    """One or more probe queries failed in the browser"""
+
+
+def xpath_literal(text):
+    """Quote text as an XPath 1.0 string literal"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def text_xpath(text):
+    """XPath matching elements whose own text contains text"""
+    return f"//*[contains(text(), {xpath_literal(text)})]"
+
+
+class DomProbe:
+    """A batch of DOM queries evaluated by a single injected script.
+
+    text() and xpath() count matching elements with the same XPath the checks
+    used with find_elements, selector() counts CSS matches, attribute() reads an
+    attribute of the first CSS match and local_storage() reads a key. run()
+    returns every value keyed by the name it was registered under.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def _add(self, name, query_type, expr, **extra):
+        query = {'name': name, 'type': query_type, 'expr': expr}
+        query.update(extra)
+        self.queries.append(query)
+        return self
+
+    def text(self, name, text):
+        return self._add(name, 'xpath', text_xpath(text))
+
+    def xpath(self, name, expression):
+        return self._add(name, 'xpath', expression)
+
+    def selector(self, name, css):
+        return self._add(name, 'selector', css)
+
+    def attribute(self, name, css, attribute):
+        return self._add(name, 'attribute', css, attr=attribute)
+
+    def local_storage(self, name, key):
+        return self._add(name, 'localStorage', key)
+
+    def run(self, driver):
+        """Evaluate every query in the browser and return the values by name"""
+        result = driver.execute_script(PROBE_SCRIPT, self.queries)
+        if result['errors']:
+            raise ProbeError(f"Probe queries failed: {result['errors']}")
+        return result['values']
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+WebDriver pool for the HeadwayOS browser suites
+Keeps pre-warmed browser sessions, hands one to each check and recycles unhealthy ones
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+DRIVER_POOL_SIZE = 3
+# Recycle a session after this many checks or once its browser grows past the RSS limit
+DRIVER_MAX_USES = 20
+DRIVER_MAX_RSS_MB = 1024
+
+
+def process_tree_rss_kb(root_pid):
+    """Resident memory of a process and all of its descendants, from /proc"""
+    if not root_pid or not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces; the parent pid follows the closing paren
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, ()))
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+class PooledDriver:
+    """A browser session and its pool bookkeeping"""
+
+    def __init__(self, index, driver, startup_ms):
+        self.index = index
+        self.driver = driver
+        self.startup_ms = [startup_ms]
+        self.uses = 0
+        self.total_uses = 0
+        self.recycles = 0
+        self.last_recycle_reason = None
+        self.rss_kb = None
+        self.js_heap_bytes = None
+
+    def replace(self, driver, startup_ms, reason):
+        self.driver = driver
+        self.startup_ms.append(startup_ms)
+        self.uses = 0
+        self.recycles += 1
+        self.last_recycle_reason = reason
+
+
+class DriverPool:
+    """Fixed-size pool of pre-warmed WebDriver sessions.
+
+    factory creates a ready-to-use driver. acquire() checks a session out for
+    the duration of a with block; on return the session is probed and replaced
+    when its browser has crashed, it has served max_uses checks, or its process
+    tree has grown past max_rss_mb.
+    """
+
+    def __init__(self, factory, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES,
+                 max_rss_mb=DRIVER_MAX_RSS_MB):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.drivers = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _create(self):
+        start = time.perf_counter()
+        driver = self.factory()
+        return driver, (time.perf_counter() - start) * 1000
+
+    def start(self):
+        """Start every session in parallel; raises if any of them fails to start"""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._create) for _ in range(self.size)]
+            created = []
+            error = None
+            for future in futures:
+                try:
+                    created.append(future.result())
+                except Exception as e:
+                    error = error or e
+
+        if error:
+            for driver, _ in created:
+                self._quit(driver)
+            raise error
+
+        for index, (driver, startup_ms) in enumerate(created):
+            pooled = PooledDriver(index, driver, startup_ms)
+            self.drivers.append(pooled)
+            self._idle.put(pooled)
+
+    @contextmanager
+    def acquire(self):
+        """Check a session out of the pool"""
+        pooled = self._idle.get()
+        try:
+            if pooled.driver is None:
+                # An earlier restart failed; try again before giving up on the slot
+                driver, startup_ms = self._create()
+                with self._lock:
+                    pooled.replace(driver, startup_ms, pooled.last_recycle_reason)
+            pooled.uses += 1
+            pooled.total_uses += 1
+            yield pooled.driver
+        finally:
+            self._release(pooled)
+
+    def _release(self, pooled):
+        reason = self._recycle_reason(pooled) if pooled.driver is not None else None
+        if reason:
+            self._quit(pooled.driver)
+            try:
+                driver, startup_ms = self._create()
+            except Exception:
+                driver, startup_ms = None, None
+                reason = f"{reason}, restart failed"
+            with self._lock:
+                if driver is None:
+                    pooled.driver = None
+                    pooled.last_recycle_reason = reason
+                else:
+                    pooled.replace(driver, startup_ms, reason)
+        self._idle.put(pooled)
+
+    def _recycle_reason(self, pooled):
+        try:
+            pooled.js_heap_bytes = pooled.driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+            )
+        except Exception:
+            return "crashed"
+
+        service = getattr(pooled.driver, 'service', None)
+        process = getattr(service, 'process', None)
+        pooled.rss_kb = process_tree_rss_kb(process.pid if process else None)
+
+        if self.max_rss_mb and pooled.rss_kb and pooled.rss_kb > self.max_rss_mb * 1024:
+            return "memory"
+        if self.max_uses and pooled.uses >= self.max_uses:
+            return "max uses"
+        return None
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every session"""
+        for pooled in self.drivers:
+            if pooled.driver is not None:
+                self._quit(pooled.driver)
+
+    def stats(self):
+        """Per-session startup time, usage and memory"""
+        with self._lock:
+            return [
+                {
+                    'driver': pooled.index,
+                    'startup_ms': [round(ms, 1) for ms in pooled.startup_ms],
+                    'uses': pooled.total_uses,
+                    'recycles': pooled.recycles,
+                    'last_recycle_reason': pooled.last_recycle_reason,
+                    'rss_kb': pooled.rss_kb,
+                    'js_heap_bytes': pooled.js_heap_bytes
+                }
+                for pooled in self.drivers
+            ]
+
+
+def print_driver_stats(stats):
+    """Print per-session pool statistics in the suite summary format"""
+    print("🌐 Browser sessions:")
+    for driver in stats:
+        rss = f"{driver['rss_kb'] / 1024:.0f}MB RSS" if driver['rss_kb'] else "RSS n/a"
+        heap = f"{driver['js_heap_bytes'] / 1048576:.1f}MB JS heap" if driver['js_heap_bytes'] else "JS heap n/a"
+        startups = ", ".join(f"{ms:.0f}ms" for ms in driver['startup_ms'])
+        print(f"   • driver {driver['driver']}: startup {startups}, {driver['uses']} checks, "
+              f"{driver['recycles']} recycled, {rss}, {heap}")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP session for the HeadwayOS test suites
+Keeps connections to the Next.js server alive and reports how often they are reused
+"""
+
+import time
+
+import requests
+from urllib3.util.retry import Retry
+
+from .json_stream import STREAM_CHUNK_SIZE, ArrayStream
+from .latency import LatencyRecorder, endpoint_key
+from .payload import PayloadRecorder
+from .phases import TimedHTTPAdapter, begin_phases, end_phases, response_phases
+
+# Defaults - a handful of hosts, a few connections to each
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+POOL_BLOCK = True
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = (502, 503, 504)
+# POST /api/status inserts a document, so it is never retried
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+def build_retry(total=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, status_forcelist=RETRY_STATUSES):
+    """Build the retry policy shared by every mounted adapter"""
+    return Retry(
+        total=total,
+        connect=total,
+        read=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=RETRY_METHODS,
+        # Hand the final response back so tests can report the real status code
+        raise_on_status=False
+    )
+
+
+class TimedSession(requests.Session):
+    """Session that times every request into a LatencyRecorder.
+
+    total is measured with perf_counter around the whole call, including the
+    body download unless the request streams. Through a TimedHTTPAdapter each
+    request is also split into dns, connect and tls (new connections only),
+    ttfb and download; Server-Timing entries are recorded as server.<name>.
+    Body sizes go to a PayloadRecorder, and response.json() is timed as
+    json_decode and counts the documents of a top-level array.
+
+    A streamed response is timed when it is closed, so total and download
+    cover however much of the body the caller read. Its json_array() decodes
+    a top-level array chunk by chunk through an ArrayStream and closes it.
+    """
+
+    def __init__(self, recorder=None, payload=None):
+        super().__init__()
+        self.latency = recorder if recorder is not None else LatencyRecorder()
+        self.payload = payload if payload is not None else PayloadRecorder()
+
+    def request(self, method, url, *args, **kwargs):
+        endpoint = endpoint_key(method, url)
+        phases = begin_phases()
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            self.latency.record_error(endpoint)
+            raise
+        finally:
+            end_phases()
+        end = time.perf_counter()
+        stream = kwargs.get('stream', False)
+        for phase, value_ms in response_phases(phases, response, end, stream).items():
+            self.latency.record(endpoint, phase, value_ms)
+        if stream:
+            self._time_stream(endpoint, response, start, phases.get('headers_at'))
+        else:
+            self.latency.record(endpoint, 'total', (end - start) * 1000)
+            self.payload.record_body(endpoint, self._wire_bytes(response), len(response.content))
+        self._time_json(endpoint, response)
+        return response
+
+    @staticmethod
+    def _wire_bytes(response):
+        # urllib3 counts the bytes it read off the connection, before decompression
+        tell = getattr(response.raw, 'tell', None)
+        try:
+            return tell() if tell else None
+        except (OSError, ValueError):
+            return None
+
+    def _time_json(self, endpoint, response):
+        decode = response.json
+
+        def timed_json(**kwargs):
+            start = time.perf_counter()
+            data = decode(**kwargs)
+            self.latency.record(endpoint, 'json_decode', (time.perf_counter() - start) * 1000)
+            if isinstance(data, list):
+                self.payload.record_documents(endpoint, len(data))
+            return data
+
+        response.json = timed_json
+
+    def _time_stream(self, endpoint, response, start, headers_at):
+        close = response.close
+        closed = False
+
+        def timed_close():
+            nonlocal closed
+            if not closed:
+                closed = True
+                end = time.perf_counter()
+                self.latency.record(endpoint, 'total', (end - start) * 1000)
+                if headers_at is not None:
+                    self.latency.record(endpoint, 'download', (end - headers_at) * 1000)
+            close()
+
+        def json_array(validate=None, **options):
+            stream = ArrayStream(validate=validate, **options)
+            decode_ms = 0.0
+            try:
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    started = time.perf_counter()
+                    stream.feed(chunk)
+                    decode_ms += (time.perf_counter() - started) * 1000
+                started = time.perf_counter()
+                stream.close()
+                decode_ms += (time.perf_counter() - started) * 1000
+            finally:
+                response.close()
+            self.latency.record(endpoint, 'json_decode', decode_ms)
+            self.payload.record_body(endpoint, self._wire_bytes(response), stream.body_bytes)
+            if stream.is_array:
+                self.payload.record_documents(endpoint, stream.count)
+            return stream
+
+        response.close = timed_close
+        response.json_array = json_array
+
+
+def build_session(headers=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                  pool_block=POOL_BLOCK, retries=None, recorder=None):
+    """Create a keep-alive session.
+
+    pool_connections is the number of per-host pools kept around, pool_maxsize the
+    number of connections kept open to each host. With pool_block the per-host limit
+    is hard: callers wait for a free connection instead of opening extra ones.
+    """
+    session = TimedSession(recorder)
+    if headers:
+        session.headers.update(headers)
+
+    adapter = TimedHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=retries if retries is not None else build_retry()
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def connection_stats(session):
+    """Collect connection reuse statistics from every pool the session opened"""
+    stats = {
+        'hosts': 0,
+        'requests': 0,
+        'connections_opened': 0,
+        'connections_reused': 0,
+        'reuse_rate': 0.0
+    }
+
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen or not hasattr(adapter, 'poolmanager'):
+            continue
+        seen.add(id(adapter))
+
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats['hosts'] += 1
+            stats['requests'] += pool.num_requests
+            stats['connections_opened'] += pool.num_connections
+
+    stats['connections_reused'] = max(stats['requests'] - stats['connections_opened'], 0)
+    if stats['requests']:
+        stats['reuse_rate'] = stats['connections_reused'] / stats['requests'] * 100
+    return stats
+
+
+def print_connection_stats(stats):
+    """Print connection reuse statistics in the suite summary format"""
+    print(f"🔌 Connections: {stats['connections_opened']} opened, "
+          f"{stats['connections_reused']} reused across {stats['requests']} requests "
+          f"({stats['reuse_rate']:.1f}% reuse, {stats['hosts']} host pool(s))")
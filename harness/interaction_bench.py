@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Interaction benchmarks for the HeadwayOS browser suites
+Times repeated clicks from input to the next paint, with React commit and render time per interaction
+"""
+
+import json
+
+from .latency import LatencyHistogram
+
+BENCH_ITERATIONS = 20
+BENCH_WARMUP = 3
+# Interaction to Next Paint is "good" up to 200ms
+NEXT_PAINT_BUDGET_MS = 200
+# Latency recorder endpoints of the benchmark are INTERACTION <step name>
+ENDPOINT_PREFIX = 'INTERACTION '
+
+# Installed with Page.addScriptToEvaluateOnNewDocument, before React loads. React
+# reports every commit to a devtools hook if one exists; this stub is that hook
+# (Fast Refresh wraps it in development and keeps calling through).
+COMMIT_HOOK_SCRIPT = """
+(function () {
+    var bench = window.__headwayCommits = {commits: []};
+    var hook = window.__REACT_DEVTOOLS_GLOBAL_HOOK__;
+    if (!hook) {
+        var nextId = 0;
+        hook = window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+            renderers: new Map(),
+            supportsFiber: true,
+            isDisabled: false,
+            inject: function (renderer) {
+                nextId += 1;
+                this.renderers.set(nextId, renderer);
+                return nextId;
+            },
+            checkDCE: function () {},
+            onScheduleFiberRoot: function () {},
+            onCommitFiberRoot: function () {},
+            onCommitFiberUnmount: function () {},
+            onPostCommitFiberRoot: function () {}
+        };
+    }
+    var onCommitFiberRoot = hook.onCommitFiberRoot;
+    hook.onCommitFiberRoot = function (id, root) {
+        var current = root && root.current;
+        // actualDuration (render time of the committed tree) exists in development and profiling builds
+        bench.commits.push({
+            at: performance.now(),
+            render: current && typeof current.actualDuration === 'number' ? current.actualDuration : null
+        });
+        return onCommitFiberRoot.apply(this, arguments);
+    };
+})();
+"""
+
+# Click, then resolve after the frame that follows: requestAnimationFrame runs
+# just before the next paint, and a message posted from it is handled just after
+MEASURE_SCRIPT = """
+var element = arguments[0];
+var done = arguments[arguments.length - 1];
+var bench = window.__headwayCommits || {commits: []};
+bench.commits = [];
+var start = performance.now();
+element.click();
+var handlerEnd = performance.now();
+requestAnimationFrame(function () {
+    var channel = new MessageChannel();
+    channel.port1.onmessage = function () {
+        var paint = performance.now();
+        channel.port1.close();
+        var commits = bench.commits;
+        var render = 0;
+        commits.forEach(function (commit) { render += commit.render || 0; });
+        done({
+            handler: handlerEnd - start,
+            next_paint: paint - start,
+            commits: commits.length,
+            commit: commits.length ? commits[commits.length - 1].at - start : null,
+            render: commits.length ? render : null,
+            hooked: !!window.__headwayCommits
+        });
+    };
+    channel.port2.postMessage(null);
+});
+"""
+
+
+def install_commit_hook(driver):
+    """Register the commit hook for every future document; False when the driver has no CDP"""
+    execute_cdp_cmd = getattr(driver, 'execute_cdp_cmd', None)
+    if execute_cdp_cmd is None:
+        return False
+    execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': COMMIT_HOOK_SCRIPT})
+    return True
+
+
+def load_scenario(path):
+    """Scenario steps from a JSON file: [{"name", "selector", "restore"?}, ...]"""
+    with open(path) as f:
+        steps = json.load(f)
+    if not isinstance(steps, list) or not all(isinstance(s, dict) and 'name' in s and 'selector' in s
+                                              for s in steps):
+        raise ValueError(f"{path}: expected a list of {{name, selector}} steps")
+    return steps
+
+
+class InteractionBenchmark:
+    """Repeated clicks on every element a scenario step selects.
+
+    Each element is clicked warmup times unmeasured and then iterations times
+    measured. A step with restore toggles something on and off, so one extra
+    unmeasured click is added when the total is odd to leave it as it was.
+    Every measured click goes into recorder as INTERACTION <step>: total is
+    input to next paint, handler the synchronous event handlers, commit the
+    time to React's last commit and render React's render time.
+    """
+
+    def __init__(self, driver, recorder, find_elements, iterations=BENCH_ITERATIONS, warmup=BENCH_WARMUP):
+        self.driver = driver
+        self.recorder = recorder
+        self.find_elements = find_elements
+        self.iterations = iterations
+        self.warmup = warmup
+        self.targets = {}
+        self.hooked = True
+
+    def measure(self, element):
+        return self.driver.execute_async_script(MEASURE_SCRIPT, element)
+
+    def run_step(self, step):
+        """Benchmark every element the step selects; returns how many there were"""
+        count = len(self.find_elements(step['selector']))
+        clicks = self.warmup + self.iterations
+        extra = 1 if step.get('restore') and clicks % 2 else 0
+        for index in range(count):
+            histogram = self.targets.setdefault(f"{step['name']} #{index}", LatencyHistogram())
+            for click in range(clicks + extra):
+                # Re-render may replace the node, so it is looked up for every click
+                element = self.find_elements(step['selector'])[index]
+                sample = self.measure(element)
+                if click < self.warmup or click >= clicks:
+                    continue
+                self.hooked = self.hooked and sample['hooked']
+                endpoint = ENDPOINT_PREFIX + step['name']
+                self.recorder.record(endpoint, 'total', sample['next_paint'])
+                self.recorder.record(endpoint, 'handler', sample['handler'])
+                if sample['commit'] is not None:
+                    self.recorder.record(endpoint, 'commit', sample['commit'])
+                if sample['render'] is not None:
+                    self.recorder.record(endpoint, 'render', sample['render'])
+                histogram.record(sample['next_paint'])
+        return count
+
+    def run(self, scenario):
+        return {step['name']: self.run_step(step) for step in scenario}
+
+    def summary(self):
+        """Input-to-next-paint statistics per element"""
+        return {target: histogram.to_dict() for target, histogram in self.targets.items()}
+
+
+def interaction_latency(latency_summary):
+    """The benchmark's endpoints of a LatencyRecorder summary"""
+    return {
+        endpoint: metrics for endpoint, metrics in latency_summary.items()
+        if endpoint.startswith(ENDPOINT_PREFIX)
+    }
+
+
+def over_budget(steps, budget_ms=NEXT_PAINT_BUDGET_MS):
+    """Descriptions of every step whose p90 input-to-next-paint latency exceeds the budget"""
+    problems = []
+    for endpoint, metrics in steps.items():
+        p90 = metrics.get('total', {}).get('p90_ms')
+        if p90 is not None and p90 > budget_ms:
+            problems.append(f"{endpoint[len(ENDPOINT_PREFIX):]} p90 {p90:.0f}ms > {budget_ms}ms")
+    return problems
+
+
+def print_bench_summary(steps, targets):
+    """Print per-step and slowest-element interaction latency in the suite summary format"""
+    if not steps:
+        return
+    print("🖱️  Interactions (input to next paint / React commit / render, p50 · p90):")
+    for endpoint, metrics in steps.items():
+        parts = []
+        for name in ('total', 'commit', 'render'):
+            stats = metrics.get(name, {})
+            if stats.get('count'):
+                parts.append(f"{stats['p50_ms']:.1f} · {stats['p90_ms']:.1f}ms")
+            else:
+                parts.append("n/a")
+        print(f"   • {endpoint[len(ENDPOINT_PREFIX):]}: {' / '.join(parts)} "
+              f"({metrics.get('total', {}).get('count', 0)} clicks)")
+    measured = [(target, stats) for target, stats in targets.items() if stats['count']]
+    slowest = sorted(measured, key=lambda item: item[1]['p90_ms'], reverse=True)[:3]
+    if slowest:
+        print("   Slowest elements (p90): " + ", ".join(f"{t} {s['p90_ms']:.1f}ms" for t, s in slowest))
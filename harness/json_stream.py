@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON decoding for the HeadwayOS test suites
+Validates the items of a top-level JSON array as the body arrives and keeps only a sample of them
+"""
+
+import codecs
+import json
+import random
+
+STREAM_CHUNK_SIZE = 64 * 1024
+SAMPLE_SIZE = 2
+MAX_INVALID = 5
+# Largest single item (or non-array body) held while waiting for the rest of it
+MAX_ITEM_BYTES = 1024 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class ArrayStream:
+    """Feed body bytes in, get per-item validation out.
+
+    validate(item) returns None for a valid item or a short reason. Items are
+    dropped as soon as they are checked, except for a reservoir sample of
+    sample_size items, so memory stays at one chunk plus the largest item
+    however long the array is. A body that is not an array is buffered (up to
+    max_item_bytes) and decoded whole into value.
+    """
+
+    def __init__(self, validate=None, sample_size=SAMPLE_SIZE, max_invalid=MAX_INVALID,
+                 max_item_bytes=MAX_ITEM_BYTES, seed=None):
+        self.validate = validate
+        self.sample_size = sample_size
+        self.max_invalid = max_invalid
+        self.max_item_bytes = max_item_bytes
+        self.rng = random.Random(seed)
+        self.decoder = json.JSONDecoder()
+        self.text = codecs.getincrementaldecoder('utf-8')()
+
+        self.is_array = None
+        self.value = None
+        self.count = 0
+        self.invalid = 0
+        self.invalid_items = []
+        self.sample = []
+        self.body_bytes = 0
+        self.max_buffered = 0
+
+        self._buffer = ''
+        self._pos = 0
+        # start -> first (after '[') / item (after ',') -> separator -> done
+        self._state = 'start'
+
+    def feed(self, chunk, final=False):
+        """Decode every complete item in chunk (bytes)"""
+        self.body_bytes += len(chunk)
+        self._buffer = self._buffer[self._pos:] + self.text.decode(chunk, final)
+        self._pos = 0
+        self.max_buffered = max(self.max_buffered, len(self._buffer))
+        self._parse(final)
+        if len(self._buffer) - self._pos > self.max_item_bytes:
+            raise ValueError(f"JSON item larger than {self.max_item_bytes} bytes")
+
+    def close(self):
+        """Finish the body; raises ValueError if it was not complete, valid JSON"""
+        self.feed(b'', final=True)
+        if self.is_array is None:
+            raise ValueError("Empty response body")
+        if self.is_array and self._state != 'done':
+            raise ValueError(f"Unterminated JSON array after {self.count} items")
+        if not self.is_array:
+            self.value = json.loads(self._buffer)
+        return self
+
+    def _skip_whitespace(self):
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return self._pos < len(self._buffer)
+
+    def _parse(self, final):
+        if self.is_array is False:
+            return
+        while self._skip_whitespace():
+            char = self._buffer[self._pos]
+            if self._state == 'start':
+                if char != '[':
+                    # Not an array: keep the whole body for a plain decode
+                    self.is_array = False
+                    return
+                self.is_array = True
+                self._state = 'first'
+                self._pos += 1
+            elif self._state == 'first' and char == ']':
+                self._state = 'done'
+                self._pos += 1
+            elif self._state in ('first', 'item'):
+                if not self._decode_item(final):
+                    return
+                self._state = 'separator'
+            elif self._state == 'separator':
+                if char not in ',]':
+                    raise ValueError(f"Expected ',' or ']' after item {self.count}, got {char!r}")
+                self._state = 'item' if char == ',' else 'done'
+                self._pos += 1
+            else:
+                raise ValueError(f"Unexpected data after the JSON array: {char!r}")
+
+    def _decode_item(self, final):
+        try:
+            item, end = self.decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False
+        if not final and not isinstance(item, (dict, list, str)) and (
+                end == len(self._buffer) or self._buffer[end] not in _WHITESPACE + ',]'):
+            # A bare number or literal may continue in the next chunk
+            return False
+        self._pos = end
+        self._check(item)
+        return True
+
+    def _check(self, item):
+        index = self.count
+        self.count += 1
+        reason = self.validate(item) if self.validate else None
+        if reason:
+            self.invalid += 1
+            if len(self.invalid_items) < self.max_invalid:
+                self.invalid_items.append({'index': index, 'reason': reason, 'item': item})
+
+        # Reservoir sampling keeps a uniform sample without holding the array
+        if len(self.sample) < self.sample_size:
+            self.sample.append(item)
+        elif self.sample_size:
+            slot = self.rng.randrange(self.count)
+            if slot < self.sample_size:
+                self.sample[slot] = item
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'invalid': self.invalid,
+            'invalid_items': self.invalid_items,
+            'sample': self.sample,
+            'body_bytes': self.body_bytes,
+            'max_buffered': self.max_buffered
+        }
+
+
+def stream_json_array(chunks, validate=None, sample_size=SAMPLE_SIZE, **options):
+    """Run an iterable of byte chunks through an ArrayStream and return it closed"""
+    stream = ArrayStream(validate=validate, sample_size=sample_size, **options)
+    for chunk in chunks:
+        stream.feed(chunk)
+    return stream.close()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Latency capture for the HeadwayOS test suites
+HDR-style histograms per endpoint, fed by timed HTTP sessions and instrumented WebDrivers
+"""
+
+import math
+import threading
+import time
+from urllib.parse import urlparse
+
+# 2^8 sub-buckets per power of two keeps every recorded value within 1% of its true value
+SUB_BUCKET_BITS = 8
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies with bounded relative error.
+
+    Values are recorded in microseconds. Below 2^SUB_BUCKET_BITS each value has
+    its own bucket; above it every power of two is split into SUB_BUCKET_COUNT / 2
+    linear buckets, as in HdrHistogram. Memory depends on the value range, not on
+    the number of samples, and histograms from different runs or workers merge
+    exactly.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    @staticmethod
+    def _index(value_us):
+        shift = max(value_us.bit_length() - SUB_BUCKET_BITS, 0)
+        return shift * SUB_BUCKET_COUNT + (value_us >> shift)
+
+    @staticmethod
+    def _upper_bound(index):
+        shift, bucket = divmod(index, SUB_BUCKET_COUNT)
+        return ((bucket + 1) << shift) - 1
+
+    def record(self, value_ms, count=1):
+        """Record a latency in milliseconds"""
+        value_us = max(int(round(value_ms * 1000)), 0)
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other):
+        """Add every sample of other into this histogram"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile(self, pct):
+        """Latency in milliseconds at or below which pct percent of samples fall"""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(pct / 100.0 * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean(self):
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+    @property
+    def max(self):
+        return self.max_us / 1000
+
+    def to_dict(self):
+        """Summary statistics in milliseconds, JSON friendly"""
+        summary = {'count': self.count}
+        if self.count:
+            summary['min_ms'] = round(self.min_us / 1000, 3)
+            summary['mean_ms'] = round(self.mean, 3)
+            for pct in REPORTED_PERCENTILES:
+                summary[f'p{pct}_ms'] = round(self.percentile(pct), 3)
+            summary['max_ms'] = round(self.max, 3)
+        return summary
+
+
+class LatencyRecorder:
+    """Thread-safe histograms keyed by endpoint and metric (total, ttfb, ...)"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, metric, value_ms):
+        with self._lock:
+            metrics = self.histograms.setdefault(endpoint, {})
+            metrics.setdefault(metric, LatencyHistogram()).record(value_ms)
+
+    def record_error(self, endpoint):
+        with self._lock:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def merge(self, histograms, errors=None):
+        """Add histograms and error counts recorded elsewhere, e.g. in another process"""
+        with self._lock:
+            for endpoint, metrics in histograms.items():
+                mine = self.histograms.setdefault(endpoint, {})
+                for metric, histogram in metrics.items():
+                    mine.setdefault(metric, LatencyHistogram()).merge(histogram)
+            for endpoint, count in (errors or {}).items():
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + count
+
+    def histogram(self, endpoint, metric='total'):
+        with self._lock:
+            return self.histograms.get(endpoint, {}).get(metric)
+
+    def summary(self):
+        """Per-endpoint histogram summaries, JSON friendly"""
+        with self._lock:
+            result = {}
+            for endpoint in sorted(set(self.histograms) | set(self.errors)):
+                metrics = self.histograms.get(endpoint, {})
+                result[endpoint] = {name: histogram.to_dict() for name, histogram in metrics.items()}
+                if endpoint in self.errors:
+                    result[endpoint]['errors'] = self.errors[endpoint]
+            return result
+
+
+def endpoint_key(method, url):
+    """Group requests by method and path, ignoring host and query string"""
+    return f"{method.upper()} {urlparse(url).path or '/'}"
+
+
+def instrument_driver(driver, recorder):
+    """Time every WebDriver command the driver sends, keyed by command name"""
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        if driver_command == 'get' and params and 'url' in params:
+            endpoint = f"WEBDRIVER get {urlparse(params['url']).path or '/'}"
+        else:
+            endpoint = f"WEBDRIVER {driver_command}"
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        except Exception:
+            recorder.record_error(endpoint)
+            raise
+        finally:
+            recorder.record(endpoint, 'total', (time.perf_counter() - start) * 1000)
+
+    driver.execute = timed_execute
+    return driver
+
+
+def print_latency_summary(summary):
+    """Print per-endpoint latency in the suite summary format"""
+    if not summary:
+        return
+    print("⏱️  Latency (p50 / p90 / p99 / max):")
+    for endpoint, metrics in summary.items():
+        total = metrics.get('total', {})
+        if not total.get('count'):
+            continue
+        line = (f"   • {endpoint}: {total['p50_ms']:.1f} / {total['p90_ms']:.1f} / "
+                f"{total['p99_ms']:.1f} / {total['max_ms']:.1f}ms ({total['count']} calls)")
+        ttfb = metrics.get('ttfb', {})
+        if ttfb.get('count'):
+            line += f", TTFB p50 {ttfb['p50_ms']:.1f}ms"
+        print(line)
+
+        # Connection phases and Server-Timing entries, where the transport captured them
+        phases = [
+            f"{name} {metrics[name]['p50_ms']:.1f}" for name in ('dns', 'connect', 'tls', 'download')
+            if metrics.get(name, {}).get('count')
+        ]
+        server = [
+            f"{name[len('server.'):]} {metric['p50_ms']:.1f}" for name, metric in metrics.items()
+            if name.startswith('server.') and metric.get('count')
+        ]
+        if phases or server:
+            detail = f"     p50 {', '.join(phases)}ms" if phases else "    "
+            if server:
+                detail += f"{';' if phases else ''} server {', '.join(server)}ms"
+            print(detail)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Leak detection for the HeadwayOS browser suites
+Navigates back and forth between pages in one session and fits the growth of JS heap, DOM nodes and listeners
+"""
+
+import time
+
+from .soak import linear_fit
+
+LEAK_CYCLES = 200
+# Cycles before the baseline sample, so caches and lazily loaded chunks are in place
+LEAK_WARMUP = 5
+SAMPLE_EVERY = 10
+# Growth per navigation cycle above which a steady trend counts as a leak
+LEAK_BUDGETS = {
+    'js_heap_bytes': 50 * 1024,
+    'nodes': 20,
+    'listeners': 5
+}
+# A fitted slope only counts as growth when the samples follow it this closely
+MIN_CORRELATION = 0.8
+
+# Client-side navigation through the Next.js app router, which keeps the
+# document (and anything it leaks) alive; false when the router is not exposed
+NAVIGATE_SCRIPT = """
+var router = window.next && window.next.router;
+if (!router || typeof router.push !== 'function') return false;
+router.push(arguments[0]);
+return true;
+"""
+
+# Fallback sample without CDP: performance.memory is Chrome-only and coarse
+# unless Chrome runs with --enable-precise-memory-info
+SAMPLE_SCRIPT = """
+if (typeof window.gc === 'function') window.gc();
+return {
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+    nodes: document.getElementsByTagName('*').length,
+    listeners: null,
+    documents: null
+};
+"""
+
+CDP_METRICS = {
+    'JSHeapUsedSize': 'js_heap_bytes',
+    'Nodes': 'nodes',
+    'JSEventListeners': 'listeners',
+    'Documents': 'documents'
+}
+
+
+class LeakCheck:
+    """Navigate between routes in one session and sample retained memory.
+
+    routes is a list of (path, rendered) pairs; one cycle visits each in
+    turn and waits for its rendered condition. Navigation goes through the
+    app router when the page exposes it and falls back to a full page load
+    otherwise. After warmup cycles a baseline is sampled, then every
+    sample_every cycles: garbage is collected first, so what is sampled is
+    what the pages retain. With CDP the sample is Chrome's own counters (JS
+    heap, all live DOM nodes including detached ones, event listeners,
+    documents); without it, performance.memory and the attached node count.
+    Every navigation is timed into recorder as NAVIGATE <path>.
+    """
+
+    def __init__(self, driver, waiter, routes, recorder=None, base_url='', cycles=LEAK_CYCLES,
+                 warmup=LEAK_WARMUP, sample_every=SAMPLE_EVERY):
+        self.driver = driver
+        self.waiter = waiter
+        self.routes = routes
+        self.recorder = recorder
+        self.base_url = base_url
+        self.cycles = cycles
+        self.warmup = warmup
+        self.sample_every = sample_every
+        self.cdp = hasattr(driver, 'execute_cdp_cmd')
+        self.samples = []
+        self.navigations = {'client': 0, 'full': 0}
+
+    def navigate(self, path, rendered):
+        start = time.perf_counter()
+        if self.driver.execute_script(NAVIGATE_SCRIPT, path):
+            self.navigations['client'] += 1
+        else:
+            self.driver.get(f"{self.base_url}{path}")
+            self.navigations['full'] += 1
+        self.waiter.until(f"{path} render", rendered)
+        if self.recorder is not None:
+            self.recorder.record(f"NAVIGATE {path}", 'total', (time.perf_counter() - start) * 1000)
+
+    def sample(self, cycle):
+        if self.cdp:
+            self.driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+            metrics = self.driver.execute_cdp_cmd('Performance.getMetrics', {}).get('metrics', [])
+            values = {name: None for name in CDP_METRICS.values()}
+            for metric in metrics:
+                if metric['name'] in CDP_METRICS:
+                    values[CDP_METRICS[metric['name']]] = metric['value']
+        else:
+            values = self.driver.execute_script(SAMPLE_SCRIPT)
+        values['cycle'] = cycle
+        self.samples.append(values)
+        return values
+
+    def run(self):
+        """Run every cycle and return the samples with their fitted trends"""
+        if self.cdp:
+            self.driver.execute_cdp_cmd('Performance.enable', {})
+        for cycle in range(1, self.warmup + self.cycles + 1):
+            for path, rendered in self.routes:
+                self.navigate(path, rendered)
+            measured = cycle - self.warmup
+            if measured >= 0 and (measured % self.sample_every == 0 or measured == self.cycles):
+                self.sample(measured)
+        trends = fit_trends(self.samples)
+        return {
+            'cycles': self.cycles,
+            'warmup': self.warmup,
+            'routes': [path for path, _ in self.routes],
+            'source': 'cdp' if self.cdp else 'performance.memory',
+            'navigations': dict(self.navigations),
+            'trends': trends,
+            'leaks': find_leaks(trends),
+            'samples': self.samples
+        }
+
+
+def fit_trends(samples):
+    """Per metric: first and last sample, retained growth and the fitted slope per cycle"""
+    trends = {}
+    for metric in LEAK_BUDGETS:
+        points = [(s['cycle'], s[metric]) for s in samples if s.get(metric) is not None]
+        if len(points) < 2:
+            continue
+        slope, correlation = linear_fit([p[0] for p in points], [p[1] for p in points])
+        trends[metric] = {
+            'first': points[0][1],
+            'last': points[-1][1],
+            'growth': points[-1][1] - points[0][1],
+            'per_cycle': slope,
+            'correlation': correlation
+        }
+    return trends
+
+
+def find_leaks(trends, budgets=LEAK_BUDGETS, min_correlation=MIN_CORRELATION):
+    """Descriptions of every metric that grows steadily faster than its budget"""
+    leaks = []
+    for metric, trend in trends.items():
+        slope, correlation = trend['per_cycle'], trend['correlation']
+        if slope is None or correlation is None:
+            continue
+        if slope > budgets[metric] and correlation >= min_correlation:
+            leaks.append(f"{metric} +{_amount(metric, slope)} per cycle (r = {correlation:.2f}, "
+                         f"limit {_amount(metric, budgets[metric])})")
+    return leaks
+
+
+def _amount(metric, value):
+    if metric == 'js_heap_bytes':
+        return f"{value / 1024:.1f}KB"
+    return f"{value:.1f}"
+
+
+def print_leak_report(report):
+    """Print retained growth per metric in the suite summary format"""
+    if not report:
+        return
+    navigations = report['navigations']
+    print(f"🧪 Leak check: {report['cycles']} cycles of {' ↔ '.join(report['routes'])} "
+          f"({navigations['client']} client-side, {navigations['full']} full navigations, {report['source']}):")
+    for metric, trend in report['trends'].items():
+        correlation = f"{trend['correlation']:.2f}" if trend['correlation'] is not None else "n/a"
+        slope = _amount(metric, trend['per_cycle']) if trend['per_cycle'] is not None else "n/a"
+        print(f"   • {metric}: {_amount(metric, trend['first'])} → {_amount(metric, trend['last'])}, "
+              f"{slope} per cycle (r = {correlation})")
+    for leak in report['leaks']:
+        print(f"⚠️  Growing: {leak}")
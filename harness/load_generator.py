@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Load generation for the HeadwayOS /api/status endpoints
+Drives a POST/GET mix through a shared session and reports per-route latency
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+
+from .json_stream import STREAM_CHUNK_SIZE
+from .latency import LatencyHistogram
+
+STATUS_POST = "POST /api/status"
+STATUS_GET = "GET /api/status"
+ROUTES = (STATUS_POST, STATUS_GET)
+# Open-model arrival processes: evenly spaced, or exponential gaps around the target rate
+ARRIVALS = ('constant', 'poisson')
+# A load process busier than this (percent of one core) is limiting the run, not the server
+CPU_SATURATION_PCT = 80.0
+
+
+class RouteStats:
+    """Latency histogram and error counts for a single route.
+
+    latency is what the report's percentiles come from. Under an open arrival
+    model it runs from the intended send time, and service (from the actual
+    send) and lag (how late the request left) are kept alongside.
+    """
+
+    def __init__(self, route, corrected=False):
+        self.route = route
+        self.corrected = corrected
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.lag = LatencyHistogram()
+        self.errors = 0
+        self.statuses = {}
+        self.lock = threading.Lock()
+
+    def record(self, latency_ms, success, status, service_ms=None, lag_ms=None):
+        with self.lock:
+            self.latency.record(latency_ms)
+            if service_ms is not None:
+                self.service.record(service_ms)
+            if lag_ms is not None:
+                self.lag.record(lag_ms)
+            if not success:
+                self.errors += 1
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
+    def merge(self, latency, errors, statuses, service=None, lag=None):
+        """Add another worker's results for this route"""
+        with self.lock:
+            self.latency.merge(latency)
+            if service is not None:
+                self.service.merge(service)
+            if lag is not None:
+                self.lag.merge(lag)
+            self.errors += errors
+            for status, count in statuses.items():
+                self.statuses[status] = self.statuses.get(status, 0) + count
+
+    def summary(self, elapsed):
+        count = self.latency.count
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'error_rate': (self.errors / count * 100) if count else 0.0,
+            'throughput': count / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': self.latency.percentile(50),
+            'p95_ms': self.latency.percentile(95),
+            'p99_ms': self.latency.percentile(99),
+            'max_ms': self.latency.max,
+            'statuses': dict(self.statuses),
+            **(self._corrected_summary() if self.corrected else {})
+        }
+
+    def _corrected_summary(self):
+        return {
+            'service_p50_ms': self.service.percentile(50),
+            'service_p99_ms': self.service.percentile(99),
+            'send_lag_p99_ms': self.lag.percentile(99),
+            'send_lag_max_ms': self.lag.max
+        }
+
+
+class LoadGenerator:
+    """Load against /api/status, closed-loop or with open-model arrivals.
+
+    concurrency workers each send one request at a time. When rate is set the
+    workers share a pacing schedule so the combined request rate stays at the
+    target; otherwise every worker sends as fast as the server answers. seed
+    offsets the workers' route choices, so generators in different processes
+    do not send the same sequence.
+
+    With arrivals ('constant' or 'poisson', needs rate) the schedule is fixed
+    in advance and never waits for the server: a request whose slot passed
+    while every worker was busy is sent late, and its latency still counts
+    from the slot. A stall therefore shows up in every request it delayed
+    instead of only the one that hit it (coordinated omission).
+
+    phase delays the first slot by that many seconds, so paced generators
+    in several processes can interleave their slots instead of sending
+    together.
+    """
+
+    def __init__(self, session, base_url, duration=30, concurrency=8, rate=None,
+                 post_ratio=0.2, timeout=10, client_name="HeadwayOS_Load_Client", seed=0,
+                 arrivals=None, phase=0.0):
+        if arrivals and not rate:
+            raise ValueError("An open arrival model needs a target rate")
+        self.session = session
+        self.base_url = base_url
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rate = rate
+        self.post_ratio = post_ratio
+        self.timeout = timeout
+        self.client_name = client_name
+        self.seed = seed
+        self.arrivals = arrivals
+        self.phase = phase
+        self.stats = {route: RouteStats(route, corrected=bool(arrivals)) for route in ROUTES}
+        self._schedule_lock = threading.Lock()
+        self._arrival_rng = random.Random(f"arrivals-{seed}")
+        self._next_send = 0.0
+        self._deadline = 0.0
+
+    def _next_slot(self):
+        """Claim the next send time on the shared schedule"""
+        with self._schedule_lock:
+            if self.arrivals:
+                # Open model: slots never move, however far behind the workers are
+                slot = self._next_send
+            else:
+                slot = max(self._next_send, time.perf_counter())
+            if self.arrivals == 'poisson':
+                self._next_send = slot + self._arrival_rng.expovariate(self.rate)
+            else:
+                self._next_send = slot + 1.0 / self.rate
+            return slot
+
+    def _start_schedule(self, start):
+        self._next_send = start + self.phase
+        self._deadline = start + self.duration
+
+    def _send(self, route, intended=None):
+        start = time.perf_counter()
+        try:
+            if route == STATUS_POST:
+                response = self.session.post(
+                    f"{self.base_url}/status",
+                    json={"client_name": self.client_name},
+                    timeout=self.timeout
+                )
+                response.content
+            else:
+                # Read the body so latency covers the full transfer, in chunks so
+                # concurrent workers never hold a whole GET payload at once
+                response = self.session.get(f"{self.base_url}/status", timeout=self.timeout, stream=True)
+                with response:
+                    for _ in response.iter_content(STREAM_CHUNK_SIZE):
+                        pass
+            status = response.status_code
+            success = status == 200
+        except requests.exceptions.RequestException as e:
+            status = type(e).__name__
+            success = False
+        end = time.perf_counter()
+        if self.arrivals:
+            self.stats[route].record(
+                (end - intended) * 1000, success, status,
+                service_ms=(end - start) * 1000,
+                lag_ms=max(start - intended, 0.0) * 1000
+            )
+        else:
+            self.stats[route].record((end - start) * 1000, success, status)
+
+    def _worker(self, seed):
+        rng = random.Random(seed)
+        while True:
+            slot = None
+            if self.rate:
+                slot = self._next_slot()
+                if slot >= self._deadline:
+                    return
+                delay = slot - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            elif time.perf_counter() >= self._deadline:
+                return
+            route = STATUS_POST if rng.random() < self.post_ratio else STATUS_GET
+            self._send(route, slot)
+
+    def run(self, start_at=None):
+        """Run for the configured duration and return the report.
+
+        start_at is a time.time() instant to start from, shared by generators
+        in different processes so their phases line up.
+        """
+        start = time.perf_counter()
+        if start_at is not None:
+            # The schedule is anchored at the shared instant itself, not at whenever the sleep ends
+            start += start_at - time.time()
+            delay = start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        cpu_start = time.process_time()
+        self._start_schedule(start)
+
+        workers = [
+            threading.Thread(target=self._worker, args=(self.seed + i,), daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        elapsed = time.perf_counter() - start
+        cpu_s = time.process_time() - cpu_start
+        routes = {route: stats.summary(elapsed) for route, stats in self.stats.items()}
+
+        total_requests = sum(r['requests'] for r in routes.values())
+        total_errors = sum(r['errors'] for r in routes.values())
+        return {
+            'config': {
+                'duration': self.duration,
+                'concurrency': self.concurrency,
+                'rate': self.rate,
+                'arrivals': self.arrivals,
+                'post_ratio': self.post_ratio
+            },
+            'elapsed': elapsed,
+            'requests': total_requests,
+            'errors': total_errors,
+            'error_rate': (total_errors / total_requests * 100) if total_requests else 0.0,
+            'throughput': total_requests / elapsed if elapsed > 0 else 0.0,
+            'routes': routes,
+            'client_cpu': client_cpu([cpu_s / elapsed * 100 if elapsed > 0 else 0.0])
+        }
+
+
+def client_cpu(process_pcts, cores=None):
+    """CPU use of the load processes, each as a percent of one core.
+
+    A Python process cannot use much more than one core for request handling,
+    so one process near 100% means the client, not the server, set the pace.
+    """
+    cores = cores or os.cpu_count() or 1
+    total = sum(process_pcts)
+    return {
+        'processes': len(process_pcts),
+        'per_process_pct': [round(pct, 1) for pct in process_pcts],
+        'max_process_pct': round(max(process_pcts, default=0.0), 1),
+        'cores_used': round(total / 100, 2),
+        'cores': cores,
+        'saturated': any(pct >= CPU_SATURATION_PCT for pct in process_pcts)
+                     or total / 100 >= cores * CPU_SATURATION_PCT / 100
+    }
+
+
+def print_client_cpu(cpu):
+    """Print client CPU use and whether it limited the run"""
+    print(f"🖥️  Client CPU: {cpu['cores_used']:.2f} of {cpu['cores']} cores across {cpu['processes']} "
+          f"process(es), busiest {cpu['max_process_pct']:.0f}% of a core")
+    if cpu['saturated']:
+        print("⚠️  Client CPU saturated - throughput and latency reflect the load driver, not the server; "
+              "rerun with more --processes or a lower --rate")
+
+
+def print_load_report(report):
+    """Print a load report in the suite summary format"""
+    print("\n" + "=" * 60)
+    print("📊 LOAD TEST SUMMARY")
+    print("=" * 60)
+    print(f"⏱️  Duration: {report['elapsed']:.1f}s")
+    print(f"📨 Requests: {report['requests']} ({report['throughput']:.1f} req/s)")
+    print(f"❌ Errors: {report['errors']} ({report['error_rate']:.2f}%)")
+    if report.get('client_cpu'):
+        print_client_cpu(report['client_cpu'])
+    if report['config'].get('arrivals'):
+        print(f"🕒 Open model: {report['config']['arrivals']} arrivals at {report['config']['rate']:.1f} req/s, "
+              f"latency measured from the intended send time")
+
+    for route, stats in report['routes'].items():
+        print(f"\n   {route}")
+        print(f"      requests: {stats['requests']}  throughput: {stats['throughput']:.1f} req/s  "
+              f"errors: {stats['error_rate']:.2f}%")
+        print(f"      p50: {stats['p50_ms']:.1f}ms  p95: {stats['p95_ms']:.1f}ms  "
+              f"p99: {stats['p99_ms']:.1f}ms  max: {stats['max_ms']:.1f}ms")
+        if 'service_p99_ms' in stats:
+            print(f"      service p50: {stats['service_p50_ms']:.1f}ms  p99: {stats['service_p99_ms']:.1f}ms  "
+                  f"send lag p99: {stats['send_lag_p99_ms']:.1f}ms  max: {stats['send_lag_max_ms']:.1f}ms")
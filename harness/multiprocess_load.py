@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Multi-process load generation for the HeadwayOS /api/status endpoints
+Runs one LoadGenerator per process so the GIL caps each worker group, not the whole client
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from .http_session import POOL_MAXSIZE, build_session, connection_stats
+from .latency import LatencyRecorder
+from .load_generator import ROUTES, LoadGenerator, RouteStats, client_cpu
+
+# Time allowed for every process to start and build its session before the run is abandoned
+START_TIMEOUT = 60
+# Time allowed beyond the run duration for a process to report back
+RESULT_GRACE = 30
+# Lead between publishing the shared start instant and the first send
+START_LEAD = 0.2
+
+
+def default_processes(concurrency):
+    """One process per core, but never more processes than workers"""
+    return max(min(os.cpu_count() or 1, concurrency), 1)
+
+
+def split(total, parts):
+    """Split total into parts integers that differ by at most one"""
+    share, extra = divmod(total, parts)
+    return [share + (1 if i < extra else 0) for i in range(parts)]
+
+
+def _load_process(index, config, barrier, go, start_at, results):
+    """Body of one load process: build a session, wait for the others, run from the shared start, report"""
+    try:
+        session = build_session(headers=config['headers'], pool_maxsize=max(POOL_MAXSIZE, config['concurrency']))
+        generator = LoadGenerator(
+            session,
+            config['base_url'],
+            duration=config['duration'],
+            concurrency=config['concurrency'],
+            rate=config['rate'],
+            post_ratio=config['post_ratio'],
+            timeout=config['timeout'],
+            seed=config['seed'],
+            arrivals=config['arrivals'],
+            phase=config['phase']
+        )
+        barrier.wait(START_TIMEOUT)
+        if not go.wait(START_TIMEOUT):
+            raise TimeoutError("no start time published")
+        report = generator.run(start_at=start_at.value)
+        results.put({
+            'index': index,
+            'report': report,
+            'routes': {
+                route: {
+                    'latency': stats.latency,
+                    'service': stats.service,
+                    'lag': stats.lag,
+                    'errors': stats.errors,
+                    'statuses': stats.statuses
+                }
+                for route, stats in generator.stats.items()
+            },
+            'latency': session.latency.histograms,
+            'latency_errors': session.latency.errors,
+            'connections': connection_stats(session)
+        })
+        session.close()
+    except threading.BrokenBarrierError:
+        results.put({'index': index, 'error': "start barrier broken"})
+    except Exception as e:
+        barrier.abort()
+        results.put({'index': index, 'error': f"{type(e).__name__}: {e}"})
+
+
+def merge_connection_stats(stats):
+    merged = {
+        'hosts': sum(s['hosts'] for s in stats),
+        'requests': sum(s['requests'] for s in stats),
+        'connections_opened': sum(s['connections_opened'] for s in stats)
+    }
+    merged['connections_reused'] = max(merged['requests'] - merged['connections_opened'], 0)
+    merged['reuse_rate'] = merged['connections_reused'] / merged['requests'] * 100 if merged['requests'] else 0.0
+    return merged
+
+
+class MultiProcessLoad:
+    """LoadGenerator spread over processes, with one merged report.
+
+    Workers are split evenly between processes. Every process builds its own
+    keep-alive session and waits on a barrier; once all are ready the parent
+    publishes one start instant that every schedule is anchored to. Route
+    histograms are merged exactly, and each process reports how much of a
+    core it used, which shows whether the client limited the run.
+
+    A paced run (rate without arrivals, or constant arrivals) gives every
+    process rate / processes with its first slot index / rate after the
+    start, so the processes' slots interleave into one evenly spaced
+    schedule at the full rate instead of going out in bursts. Poisson shares
+    follow the workers and add up to one Poisson stream at the full rate.
+    """
+
+    def __init__(self, base_url, headers=None, duration=30, concurrency=8, rate=None, post_ratio=0.2,
+                 timeout=10, processes=None, recorder=None, arrivals=None):
+        self.base_url = base_url
+        self.headers = headers
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rate = rate
+        self.post_ratio = post_ratio
+        self.timeout = timeout
+        self.arrivals = arrivals
+        self.processes = min(processes or default_processes(concurrency), concurrency)
+        self.latency = recorder if recorder is not None else LatencyRecorder()
+        self.connections = None
+
+    def _configs(self):
+        seed = 0
+        configs = []
+        for index, workers in enumerate(split(self.concurrency, self.processes)):
+            rate, phase = None, 0.0
+            if self.rate and self.arrivals == 'poisson':
+                rate = self.rate * workers / self.concurrency
+            elif self.rate:
+                rate = self.rate / self.processes
+                phase = index / self.rate
+            configs.append({
+                'base_url': self.base_url,
+                'headers': self.headers,
+                'duration': self.duration,
+                'concurrency': workers,
+                'rate': rate,
+                'post_ratio': self.post_ratio,
+                'timeout': self.timeout,
+                'seed': seed,
+                'arrivals': self.arrivals,
+                'phase': phase
+            })
+            seed += workers
+        return configs
+
+    def _collect(self, results, processes, deadline):
+        collected = []
+        while len(collected) < len(processes):
+            try:
+                collected.append(results.get(timeout=max(deadline - time.monotonic(), 0.1)))
+            except queue.Empty:
+                if time.monotonic() >= deadline or not any(p.is_alive() for p in processes):
+                    break
+        return collected
+
+    def run(self):
+        """Run every process for the configured duration and return the merged report"""
+        # spawn: the parent may already hold threads and open connections
+        context = multiprocessing.get_context('spawn')
+        barrier = context.Barrier(self.processes + 1)
+        go = context.Event()
+        start_at = context.Value('d', 0.0)
+        results = context.Queue()
+        processes = [
+            context.Process(target=_load_process, args=(i, config, barrier, go, start_at, results), daemon=True)
+            for i, config in enumerate(self._configs())
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            barrier.wait(START_TIMEOUT)
+        except threading.BrokenBarrierError:
+            pass
+        # One wall-clock instant for every process, so their phase offsets hold
+        start_at.value = time.time() + START_LEAD
+        go.set()
+        start = time.perf_counter()
+        collected = self._collect(results, processes, time.monotonic() + self.duration + RESULT_GRACE)
+        wall = time.perf_counter() - start
+        for process in processes:
+            process.join(RESULT_GRACE)
+            if process.is_alive():
+                process.terminate()
+
+        return self._merge(sorted(collected, key=lambda r: r['index']), wall)
+
+    def _merge(self, collected, wall):
+        stats = {route: RouteStats(route, corrected=bool(self.arrivals)) for route in ROUTES}
+        reports = [result for result in collected if 'report' in result]
+        failures = [result for result in collected if 'error' in result]
+        failures += [{'index': None, 'error': "no result"}] * (self.processes - len(collected))
+
+        for result in reports:
+            for route, route_stats in result['routes'].items():
+                stats[route].merge(
+                    route_stats['latency'], route_stats['errors'], route_stats['statuses'],
+                    service=route_stats['service'], lag=route_stats['lag']
+                )
+            self.latency.merge(result['latency'], result['latency_errors'])
+        self.connections = merge_connection_stats([result['connections'] for result in reports])
+
+        # Every process measures from the shared start instant, so the last one to finish bounds the run
+        elapsed = max((result['report']['elapsed'] for result in reports), default=wall)
+        routes = {route: route_stats.summary(elapsed) for route, route_stats in stats.items()}
+        total_requests = sum(r['requests'] for r in routes.values())
+        total_errors = sum(r['errors'] for r in routes.values())
+        return {
+            'config': {
+                'duration': self.duration,
+                'concurrency': self.concurrency,
+                'rate': self.rate,
+                'arrivals': self.arrivals,
+                'post_ratio': self.post_ratio,
+                'processes': self.processes
+            },
+            'elapsed': elapsed,
+            'requests': total_requests,
+            'errors': total_errors,
+            'error_rate': (total_errors / total_requests * 100) if total_requests else 0.0,
+            'throughput': total_requests / elapsed if elapsed > 0 else 0.0,
+            'routes': routes,
+            'client_cpu': client_cpu(
+                [pct for result in reports for pct in result['report']['client_cpu']['per_process_pct']]
+            ),
+            'process_failures': failures,
+            'connections': self.connections
+        }
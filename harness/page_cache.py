@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Page snapshot cache for the HeadwayOS HTML checks
+Fetches each page once per run and revalidates it with ETag/Last-Modified on re-runs
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+import requests
+
+PAGE_CACHE_FILE = '/app/.page_cache.json'
+
+
+class PageSnapshot:
+    """A fetched page, shared by every check that asks for the same URL"""
+
+    def __init__(self, url, status_code, text, headers, revalidated=False):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+        self.revalidated = revalidated
+        self.fetched_at = datetime.now().isoformat()
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derived(self, name, factory):
+        """Compute a value from the page once and share it with every later caller"""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = factory()
+            return self._derived[name]
+
+
+class PageCache:
+    """Fetch-once cache of page snapshots.
+
+    Within a run every get() for a URL returns the same snapshot; concurrent
+    callers wait for the single in-flight fetch. Snapshots with an ETag or
+    Last-Modified header are persisted to cache_file so the next run sends a
+    conditional request and reuses the stored body on 304 Not Modified.
+    Checks that change server-side state call invalidate() so the following
+    get() goes back to the server.
+    """
+
+    def __init__(self, session=None, timeout=10, cache_file=PAGE_CACHE_FILE):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.cache_file = cache_file
+        self.stats = {'fetches': 0, 'revalidated': 0, 'hits': 0}
+        self._snapshots = {}
+        self._errors = {}
+        self._url_locks = {}
+        self._lock = threading.Lock()
+        self._stored = self._load()
+
+    def _load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(self._stored, f)
+        except OSError:
+            pass
+
+    def _url_lock(self, url):
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def get(self, url):
+        """Return the snapshot for url, fetching it on first use"""
+        with self._url_lock(url):
+            if url in self._snapshots:
+                with self._lock:
+                    self.stats['hits'] += 1
+                return self._snapshots[url]
+            if url in self._errors:
+                raise self._errors[url]
+
+            try:
+                snapshot = self._fetch(url)
+            except requests.exceptions.RequestException as e:
+                # Every check sees the same failure instead of retrying the timeout
+                self._errors[url] = e
+                raise
+            self._snapshots[url] = snapshot
+            return snapshot
+
+    def _fetch(self, url):
+        stored = self._stored.get(url)
+        headers = {}
+        if stored:
+            if stored.get('etag'):
+                headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                headers['If-Modified-Since'] = stored['last_modified']
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        with self._lock:
+            self.stats['fetches'] += 1
+
+        if response.status_code == 304 and stored:
+            with self._lock:
+                self.stats['revalidated'] += 1
+            return PageSnapshot(url, stored['status_code'], stored['text'], stored['headers'],
+                                revalidated=True)
+
+        snapshot = PageSnapshot(url, response.status_code, response.text, dict(response.headers))
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified):
+            with self._lock:
+                self._stored[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'status_code': snapshot.status_code,
+                    'text': snapshot.text,
+                    'headers': snapshot.headers
+                }
+                self._save()
+        return snapshot
+
+    def invalidate(self, url=None):
+        """Forget the snapshot for url (or every snapshot) so it is fetched again"""
+        with self._lock:
+            if url is None:
+                self._snapshots.clear()
+                self._errors.clear()
+            else:
+                self._snapshots.pop(url, None)
+                self._errors.pop(url, None)
+
+    def print_stats(self):
+        """Print cache statistics in the suite summary format"""
+        print(f"📦 Page cache: {self.stats['fetches']} fetch(es), {self.stats['hits']} hit(s), "
+              f"{self.stats['revalidated']} revalidated")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Response payload tracking for the HeadwayOS test suites
+Records wire and decoded body sizes, JSON document counts and payload growth across runs
+"""
+
+import sqlite3
+import threading
+
+from .perf_history import PERF_HISTORY_DB, PerfHistory
+
+# Decoded body size above which a response is reported as over budget
+PAYLOAD_BUDGET_BYTES = 256 * 1024
+TREND_RUNS = 15
+TREND_WIDTH = 30
+PAYLOAD_METRICS = ('payload.wire_bytes', 'payload.body_bytes', 'payload.documents')
+
+
+class PayloadStats:
+    """Count, last, mean and max of one size measurement"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.last = None
+        self.max = None
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        self.last = value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'last': self.last,
+            'mean': self.total / self.count if self.count else None,
+            'max': self.max
+        }
+
+
+class PayloadRecorder:
+    """Thread-safe payload sizes keyed by endpoint.
+
+    wire_bytes is what came over the connection (compressed, if the server
+    compressed), body_bytes the decoded body, documents the length of a
+    top-level JSON array.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, endpoint, name):
+        return self.endpoints.setdefault(endpoint, {}).setdefault(name, PayloadStats())
+
+    def record_body(self, endpoint, wire_bytes, body_bytes):
+        with self._lock:
+            if wire_bytes is not None:
+                self._stats(endpoint, 'wire_bytes').record(wire_bytes)
+            self._stats(endpoint, 'body_bytes').record(body_bytes)
+
+    def record_documents(self, endpoint, count):
+        with self._lock:
+            self._stats(endpoint, 'documents').record(count)
+
+    def summary(self):
+        with self._lock:
+            return {
+                endpoint: {name: stats.to_dict() for name, stats in measurements.items()}
+                for endpoint, measurements in sorted(self.endpoints.items())
+            }
+
+
+def flatten_payload(summary):
+    """Largest payload of each endpoint in this run, as {(endpoint, 'payload.<name>'): value}"""
+    return {
+        (endpoint, f"payload.{name}"): stats['max']
+        for endpoint, measurements in summary.items()
+        for name, stats in measurements.items()
+        if stats['max'] is not None
+    }
+
+
+def over_budget(summary, budget=PAYLOAD_BUDGET_BYTES):
+    """Endpoints whose decoded body exceeded the budget"""
+    warnings = []
+    for endpoint, measurements in summary.items():
+        body = measurements.get('body_bytes')
+        if budget and body and body['max'] is not None and body['max'] > budget:
+            warnings.append({
+                'endpoint': endpoint,
+                'body_bytes': body['max'],
+                'budget_bytes': budget,
+                'documents': measurements.get('documents', {}).get('max')
+            })
+    return warnings
+
+
+def format_bytes(value):
+    if value is None:
+        return "n/a"
+    if value >= 1048576:
+        return f"{value / 1048576:.1f}MB"
+    if value >= 1024:
+        return f"{value / 1024:.1f}KB"
+    return f"{value:.0f}B"
+
+
+def print_payload_summary(summary, budget=PAYLOAD_BUDGET_BYTES):
+    """Print per-endpoint payload sizes and budget warnings in the suite summary format"""
+    if not summary:
+        return
+    print(f"📐 Payload (max, budget {format_bytes(budget)}):")
+    for endpoint, measurements in summary.items():
+        body = measurements.get('body_bytes', {})
+        wire = measurements.get('wire_bytes', {})
+        line = f"   • {endpoint}: {format_bytes(body.get('max'))} body, {format_bytes(wire.get('max'))} on the wire"
+        documents = measurements.get('documents')
+        if documents:
+            line += f", {documents['max']} documents"
+        print(line)
+    for warning in over_budget(summary, budget):
+        print(f"⚠️  {warning['endpoint']} returned {format_bytes(warning['body_bytes'])}, "
+              f"over the {format_bytes(warning['budget_bytes'])} payload budget")
+
+
+def payload_trend(suite, endpoint, runs=TREND_RUNS, path=PERF_HISTORY_DB):
+    """Payload size and latency of endpoint over the latest runs of suite, oldest first"""
+    try:
+        history = PerfHistory(path)
+        try:
+            return history.series(suite, endpoint, PAYLOAD_METRICS + ('total.p50_ms',), limit=runs)
+        finally:
+            history.close()
+    except sqlite3.Error:
+        return []
+
+
+def print_payload_trend(endpoint, rows, width=TREND_WIDTH):
+    """Chart decoded body size against p50 latency, one bar per run"""
+    rows = [row for row in rows if row.get('payload.body_bytes') is not None]
+    if len(rows) < 2:
+        return
+    largest = max(row['payload.body_bytes'] for row in rows) or 1
+    print(f"📈 {endpoint} payload vs latency, last {len(rows)} runs:")
+    for row in rows:
+        size = row['payload.body_bytes']
+        bar = "█" * max(1, round(size / largest * width))
+        documents = row.get('payload.documents')
+        documents = f"{documents:.0f} docs" if documents is not None else ""
+        latency = row.get('total.p50_ms')
+        latency = f"{latency:.1f}ms" if latency is not None else "n/a"
+        print(f"   {row['timestamp'][:16]} {row['commit'][:7]} {bar:<{width}} "
+              f"{format_bytes(size):>8} {documents:>10} p50 {latency}")
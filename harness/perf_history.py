@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Performance history for the HeadwayOS test suites
+Appends every run's latency and throughput to SQLite and flags slowdowns against a rolling baseline
+"""
+
+import os
+import sqlite3
+import statistics
+import subprocess
+from datetime import datetime
+
+PERF_HISTORY_DB = '/app/perf_history.sqlite'
+# Rolling baseline: the most recent passing runs of the same suite
+BASELINE_RUNS = 10
+MIN_BASELINE_RUNS = 5
+# A slowdown must be both statistically significant and large enough to matter
+Z_THRESHOLD = 3.0
+MIN_RELATIVE_CHANGE = 0.2
+# Floor for the baseline spread, so a perfectly stable baseline does not flag noise
+MIN_STDEV_FRACTION = 0.05
+
+# Metrics compared against the baseline, and whether a higher value is worse
+WATCHED_METRICS = {
+    'total.p50_ms': True,
+    'total.p90_ms': True,
+    'ttfb.p50_ms': True,
+    'throughput': False,
+    # localStorage churn per dashboard interaction
+    'storage.writes': True,
+    'storage.write_bytes': True
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    suite TEXT NOT NULL,
+    git_commit TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    endpoint TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_suite ON runs (suite, id);
+CREATE INDEX IF NOT EXISTS metrics_by_run ON metrics (run_id, endpoint, name);
+"""
+
+
+def current_commit():
+    """Commit of the checked-out tree, or GIT_COMMIT / 'unknown' outside a work tree"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return os.environ.get('GIT_COMMIT', 'unknown')
+
+
+def flatten_latency(summary):
+    """Turn a LatencyRecorder summary into {(endpoint, 'metric.stat'): value}"""
+    metrics = {}
+    for endpoint, histograms in summary.items():
+        for metric, stats in histograms.items():
+            if not isinstance(stats, dict):
+                continue
+            for stat, value in stats.items():
+                if stat.endswith('_ms'):
+                    metrics[(endpoint, f"{metric}.{stat}")] = value
+    return metrics
+
+
+class PerfHistory:
+    """Append-only run history with rolling-baseline regression detection"""
+
+    def __init__(self, path=PERF_HISTORY_DB):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record_run(self, suite, metrics, passed, failed, commit=None):
+        """Store one run's metrics and return its id"""
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (suite, git_commit, timestamp, passed, failed) VALUES (?, ?, ?, ?, ?)",
+                (suite, commit or current_commit(), datetime.now().isoformat(), passed, failed)
+            )
+            run_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO metrics (run_id, endpoint, name, value) VALUES (?, ?, ?, ?)",
+                [(run_id, endpoint, name, value) for (endpoint, name), value in metrics.items()
+                 if value is not None]
+            )
+        return run_id
+
+    def baseline(self, suite, endpoint, name, before_run_id=None, limit=BASELINE_RUNS):
+        """Values of a metric over the latest passing runs, before before_run_id when given"""
+        query = """
+            SELECT m.value FROM runs r JOIN metrics m ON m.run_id = r.id
+            WHERE r.suite = ? AND r.failed = 0 AND m.endpoint = ? AND m.name = ?
+        """
+        params = [suite, endpoint, name]
+        if before_run_id is not None:
+            query += " AND r.id < ?"
+            params.append(before_run_id)
+        rows = self.db.execute(query + " ORDER BY r.id DESC LIMIT ?", (*params, limit)).fetchall()
+        return [row[0] for row in rows]
+
+    def series(self, suite, endpoint, names, limit=BASELINE_RUNS):
+        """Metrics of endpoint over the latest runs of suite, oldest first, one dict per run"""
+        runs = self.db.execute(
+            "SELECT id, timestamp, git_commit FROM runs WHERE suite = ? ORDER BY id DESC LIMIT ?",
+            (suite, limit)
+        ).fetchall()
+        rows = []
+        for run_id, timestamp, commit in reversed(runs):
+            row = {'run_id': run_id, 'timestamp': timestamp, 'commit': commit}
+            placeholders = ", ".join("?" * len(names))
+            row.update(self.db.execute(
+                f"SELECT name, value FROM metrics WHERE run_id = ? AND endpoint = ? AND name IN ({placeholders})",
+                (run_id, endpoint, *names)
+            ).fetchall())
+            rows.append(row)
+        return rows
+
+    def detect_regressions(self, suite, metrics, before_run_id=None):
+        """Watched metrics that are significantly worse than their baseline.
+
+        metrics is {(endpoint, name): value} of a run not stored yet, or of
+        the stored run before_run_id.
+        """
+        regressions = []
+        for (endpoint, name), value in metrics.items():
+            if name not in WATCHED_METRICS or value is None:
+                continue
+            history = self.baseline(suite, endpoint, name, before_run_id)
+            if len(history) < MIN_BASELINE_RUNS:
+                continue
+
+            mean = statistics.mean(history)
+            stdev = max(statistics.stdev(history), abs(mean) * MIN_STDEV_FRACTION)
+            if not stdev:
+                continue
+            # Positive delta always means "worse"
+            delta = value - mean if WATCHED_METRICS[name] else mean - value
+            z_score = delta / stdev
+            relative = delta / abs(mean) if mean else 0.0
+            if z_score > Z_THRESHOLD and relative > MIN_RELATIVE_CHANGE:
+                regressions.append({
+                    'endpoint': endpoint,
+                    'metric': name,
+                    'value': round(value, 3),
+                    'baseline_mean': round(mean, 3),
+                    'baseline_runs': len(history),
+                    'change_pct': round(relative * 100, 1),
+                    'z_score': round(z_score, 2)
+                })
+        return regressions
+
+
+def check_against_history(suite, metrics, passed, failed, log_test, path=PERF_HISTORY_DB):
+    """Compare this run with the history, record it and log a FAIL for every regressed endpoint metric.
+
+    log_test is the suite's own logger, so regressions count towards the
+    failed total exactly like functional failures. The run is stored with
+    its regressions counted as failures, which keeps a slow run out of
+    later baselines. Returns the regressions.
+    """
+    try:
+        history = PerfHistory(path)
+        try:
+            regressions = history.detect_regressions(suite, metrics)
+            history.record_run(suite, metrics, passed, failed + len(regressions))
+        finally:
+            history.close()
+    except sqlite3.Error as e:
+        print(f"⚠️  Performance history unavailable: {e}")
+        return []
+
+    for regression in regressions:
+        log_test(
+            f"Performance Regression: {regression['endpoint']}",
+            False,
+            f"{regression['metric']} {regression['value']} vs baseline {regression['baseline_mean']} "
+            f"({regression['change_pct']:+.1f}%, z={regression['z_score']}) over "
+            f"{regression['baseline_runs']} runs",
+            regression
+        )
+    return regressions
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Connection-level timing for the HeadwayOS test suites
+Splits each request into DNS, connect, TLS, time-to-first-byte and download, and reads Server-Timing
+"""
+
+import re
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+# Phases recorded as latency metrics; dns, connect and tls only occur on new connections
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'download')
+SERVER_TIMING_PREFIX = 'server.'
+
+_local = threading.local()
+
+
+def begin_phases():
+    """Start collecting phase timings for the request made on this thread"""
+    _local.phases = {}
+    return _local.phases
+
+
+def end_phases():
+    phases = getattr(_local, 'phases', None)
+    _local.phases = None
+    return phases or {}
+
+
+def _add(name, value_ms):
+    phases = getattr(_local, 'phases', None)
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + value_ms
+
+
+def _mark(name):
+    phases = getattr(_local, 'phases', None)
+    if phases is not None:
+        phases[name] = time.perf_counter()
+
+
+class TimedConnectionMixin:
+    """Resolve and connect as separately timed steps, and mark send and header times.
+
+    The host is resolved here, then urllib3 connects to each address in turn,
+    so the DNS lookup is not repeated inside create_connection.
+    """
+
+    socket_ms = 0.0
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(
+                info[4][0] for info in socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            ))
+        except socket.gaierror:
+            # Let urllib3 raise its own NameResolutionError
+            addresses = [host]
+        resolved = time.perf_counter()
+        _add('dns', (resolved - start) * 1000)
+
+        try:
+            error = None
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = host
+            _add('connect', (time.perf_counter() - resolved) * 1000)
+            self.socket_ms = (time.perf_counter() - start) * 1000
+
+    def request(self, *args, **kwargs):
+        result = super().request(*args, **kwargs)
+        _mark('sent_at')
+        return result
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        _mark('headers_at')
+        return response
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+
+    def connect(self):
+        # The TLS handshake is whatever connect() spends beyond opening the socket
+        self.socket_ms = 0.0
+        start = time.perf_counter()
+        super().connect()
+        _add('tls', (time.perf_counter() - start) * 1000 - self.socket_ms)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools open timed connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+
+def _split_unquoted(text, separator):
+    """Split on separator outside double-quoted strings"""
+    parts, current, quoted, escaped = [], [], False, False
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == '\\' and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char == separator and not quoted:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header into {name: {'dur': ms or None, 'desc': str or None}}"""
+    metrics = {}
+    if not header:
+        return metrics
+    for entry in _split_unquoted(header, ','):
+        params = _split_unquoted(entry, ';')
+        name = params[0].strip()
+        if not name:
+            continue
+        metric = {'dur': None, 'desc': None}
+        for param in params[1:]:
+            key, _, value = param.partition('=')
+            key, value = key.strip().lower(), value.strip()
+            if value.startswith('"') and value.endswith('"') and len(value) > 1:
+                value = re.sub(r'\\(.)', r'\1', value[1:-1])
+            if key == 'dur':
+                try:
+                    metric['dur'] = float(value)
+                except ValueError:
+                    pass
+            elif key == 'desc':
+                metric['desc'] = value
+        metrics[name] = metric
+    return metrics
+
+
+def response_phases(phases, response, end, stream=False):
+    """Phase durations in ms for a finished request.
+
+    ttfb runs from the request being written to the response headers being
+    parsed; without connection timings (e.g. an in-process adapter) it falls
+    back to requests' elapsed time. download is only known when the body was
+    read inside the request, i.e. when it did not stream.
+    """
+    result = {name: phases[name] for name in ('dns', 'connect', 'tls') if name in phases}
+    if 'sent_at' in phases and 'headers_at' in phases:
+        result['ttfb'] = (phases['headers_at'] - phases['sent_at']) * 1000
+        if not stream:
+            result['download'] = (end - phases['headers_at']) * 1000
+    else:
+        result['ttfb'] = response.elapsed.total_seconds() * 1000
+
+    for name, metric in parse_server_timing(response.headers.get('Server-Timing')).items():
+        if metric['dur'] is not None:
+            result[SERVER_TIMING_PREFIX + name] = metric['dur']
+    return result
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Traffic replay for the HeadwayOS test suites
+Streams a JSON Lines capture, replays it with its original timing and compares latency with the capture
+"""
+
+import gzip
+import json
+import math
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from .latency import LatencyHistogram, endpoint_key
+
+REPLAY_CONCURRENCY = 8
+# Captured requests read ahead of their send time, per worker
+READ_AHEAD = 4
+# A route whose replayed p50 exceeds the captured p50 by this fraction is reported as slower
+SLOWDOWN_THRESHOLD = 0.5
+# Captured headers that describe the original connection or body; requests sets its own
+DROPPED_HEADERS = {'content-length', 'host', 'connection', 'transfer-encoding', 'keep-alive', 'upgrade'}
+
+
+def open_capture(path):
+    """Open a capture for line-by-line reading; .gz captures are decompressed on the fly"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def parse_capture_line(line):
+    """One captured request, or None for a blank line.
+
+    Each line is an object with method (default GET), path, an optional body
+    (JSON value or string), ts (seconds, relative to any fixed origin) and,
+    when the capture recorded them, latency_ms and status. Connection and
+    length headers are dropped and status is read as an int. Raises
+    ValueError for a line that is not a request, or whose ts or latency_ms
+    is not a finite number (latency_ms also not negative).
+    """
+    line = line.strip()
+    if not line:
+        return None
+    entry = json.loads(line)
+    if not isinstance(entry, dict) or not isinstance(entry.get('path'), str):
+        raise ValueError("expected an object with a path")
+    headers = entry.get('headers')
+    if not isinstance(headers, dict):
+        headers = {}
+    return {
+        'method': str(entry.get('method') or 'GET').upper(),
+        'path': entry['path'],
+        'body': entry.get('body'),
+        'headers': {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+        'ts': _finite(entry, 'ts'),
+        'latency_ms': _finite(entry, 'latency_ms', minimum=0.0),
+        'status': int(entry['status']) if entry.get('status') is not None else None
+    }
+
+
+def _finite(entry, key, minimum=None):
+    value = entry.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{key} is not a finite number: {value!r}")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{key} is below {minimum:g}: {value!r}")
+    return float(value)
+
+
+def iter_capture(path, on_invalid=None):
+    """Yield captured requests one at a time, never holding more than one line"""
+    with open_capture(path) as f:
+        for number, line in enumerate(f, 1):
+            try:
+                entry = parse_capture_line(line)
+            except (ValueError, TypeError) as e:
+                if on_invalid:
+                    on_invalid(number, e)
+                continue
+            if entry is not None:
+                yield entry
+
+
+class ReplayRouteStats:
+    """Replayed and captured latency for one route"""
+
+    def __init__(self):
+        self.replayed = LatencyHistogram()
+        self.recorded = LatencyHistogram()
+        self.lag = LatencyHistogram()
+        self.errors = 0
+        self.status_mismatches = 0
+        self.statuses = {}
+
+    def summary(self):
+        summary = {
+            'requests': self.replayed.count,
+            'errors': self.errors,
+            'status_mismatches': self.status_mismatches,
+            'statuses': dict(self.statuses),
+            'p50_ms': self.replayed.percentile(50),
+            'p99_ms': self.replayed.percentile(99),
+            'send_lag_p99_ms': self.lag.percentile(99)
+        }
+        if self.recorded.count:
+            summary['recorded_p50_ms'] = self.recorded.percentile(50)
+            summary['recorded_p99_ms'] = self.recorded.percentile(99)
+            if summary['recorded_p50_ms']:
+                summary['p50_change_pct'] = (summary['p50_ms'] / summary['recorded_p50_ms'] - 1) * 100
+            summary['slower'] = summary.get('p50_change_pct', 0.0) > SLOWDOWN_THRESHOLD * 100
+        return summary
+
+
+class ReplayEngine:
+    """Replay a capture against base_url.
+
+    The calling thread reads the file line by line, waits until each
+    request's send time - its ts offset from the first request, divided by
+    speed - and hands it to a fixed pool of workers through a short queue.
+    speed=0 sends as fast as the workers allow. Only the read-ahead queue is
+    in memory, whatever the size of the capture. Latency is measured from the
+    actual send; lag records how late each request left.
+
+    Paths that already start with base_url's path (e.g. /api/status against
+    .../api) are sent to the same origin, anything else is appended to
+    base_url.
+    """
+
+    def __init__(self, session, base_url, speed=1.0, concurrency=REPLAY_CONCURRENCY, timeout=10):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.speed = speed
+        self.concurrency = concurrency
+        self.timeout = timeout
+        parts = urlsplit(self.base_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.base_path = parts.path
+        self.routes = {}
+        self.invalid_lines = 0
+        self.failed_sends = 0
+        self.dispatched = 0
+        self._lock = threading.Lock()
+
+    def url(self, path):
+        if self.base_path and (path == self.base_path or path.startswith(self.base_path + '/')):
+            return self.origin + path
+        return self.base_url + ('' if path.startswith('/') else '/') + path
+
+    def _route(self, key):
+        with self._lock:
+            return self.routes.setdefault(key, ReplayRouteStats())
+
+    def _send(self, entry, intended):
+        url = self.url(entry['path'])
+        stats = self._route(endpoint_key(entry['method'], url))
+        body = entry['body']
+        kwargs = {'timeout': self.timeout, 'headers': entry['headers']}
+        if isinstance(body, (dict, list)):
+            kwargs['json'] = body
+        elif body is not None:
+            kwargs['data'] = body if isinstance(body, str) else json.dumps(body)
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(entry['method'], url, **kwargs)
+            response.content
+            status = response.status_code
+        except requests.exceptions.RequestException as e:
+            status = type(e).__name__
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            stats.replayed.record(latency_ms)
+            if intended is not None:
+                stats.lag.record(max(start - intended, 0.0) * 1000)
+            if entry['latency_ms'] is not None:
+                stats.recorded.record(entry['latency_ms'])
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            if entry['status'] is not None:
+                if status != entry['status']:
+                    stats.status_mismatches += 1
+                    stats.errors += 1
+            elif not isinstance(status, int) or status >= 500:
+                stats.errors += 1
+
+    def _worker(self, work):
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            # One entry that cannot be sent must not take the worker down with
+            # it: the reader would then block on a full queue forever
+            try:
+                self._send(*item)
+            except Exception:
+                with self._lock:
+                    self.failed_sends += 1
+
+    def _invalid(self, number, error):
+        self.invalid_lines += 1
+
+    def run(self, path):
+        """Replay every request of the capture at path and return the report"""
+        work = queue.Queue(maxsize=self.concurrency * READ_AHEAD)
+        workers = [
+            threading.Thread(target=self._worker, args=(work,), daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+
+        start = time.perf_counter()
+        first_ts = None
+        for entry in iter_capture(path, on_invalid=self._invalid):
+            intended = None
+            if self.speed and entry['ts'] is not None:
+                if first_ts is None:
+                    first_ts = entry['ts']
+                intended = start + (entry['ts'] - first_ts) / self.speed
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            work.put((entry, intended))
+            self.dispatched += 1
+
+        for _ in workers:
+            work.put(None)
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        routes = {route: stats.summary() for route, stats in sorted(self.routes.items())}
+        total_requests = sum(r['requests'] for r in routes.values())
+        total_errors = sum(r['errors'] for r in routes.values()) + self.failed_sends
+        attempted = total_requests + self.failed_sends
+        return {
+            'config': {
+                'capture': path,
+                'speed': self.speed,
+                'concurrency': self.concurrency,
+                'base_url': self.base_url
+            },
+            'elapsed': elapsed,
+            'requests': total_requests,
+            'invalid_lines': self.invalid_lines,
+            'failed_sends': self.failed_sends,
+            'errors': total_errors,
+            'error_rate': (total_errors / attempted * 100) if attempted else 0.0,
+            'throughput': total_requests / elapsed if elapsed > 0 else 0.0,
+            'routes': routes
+        }
+
+
+def print_replay_report(report):
+    """Print a replay report in the suite summary format"""
+    print("\n" + "=" * 60)
+    print("📊 REPLAY SUMMARY")
+    print("=" * 60)
+    speed = f"{report['config']['speed']:g}x" if report['config']['speed'] else "max speed"
+    print(f"⏱️  Duration: {report['elapsed']:.1f}s at {speed}")
+    print(f"📨 Requests: {report['requests']} ({report['throughput']:.1f} req/s)")
+    print(f"❌ Errors: {report['errors']} ({report['error_rate']:.2f}%)")
+    if report['invalid_lines']:
+        print(f"⚠️  {report['invalid_lines']} capture line(s) skipped as invalid")
+    if report['failed_sends']:
+        print(f"⚠️  {report['failed_sends']} captured request(s) could not be sent")
+
+    for route, stats in report['routes'].items():
+        print(f"\n   {route}")
+        print(f"      requests: {stats['requests']}  errors: {stats['errors']}  "
+              f"status mismatches: {stats['status_mismatches']}")
+        line = f"      replay p50: {stats['p50_ms']:.1f}ms  p99: {stats['p99_ms']:.1f}ms"
+        if 'recorded_p50_ms' in stats:
+            line += (f"  |  captured p50: {stats['recorded_p50_ms']:.1f}ms  "
+                     f"p99: {stats['recorded_p99_ms']:.1f}ms")
+            if 'p50_change_pct' in stats:
+                line += f"  ({stats['p50_change_pct']:+.0f}%)"
+        print(line)
+        if stats['send_lag_p99_ms'] > 0:
+            print(f"      send lag p99: {stats['send_lag_p99_ms']:.1f}ms")
+        if stats.get('slower'):
+            print(f"⚠️  {route} replays {stats['p50_change_pct']:.0f}% slower than captured")
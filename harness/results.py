@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Result model shared by the HeadwayOS test suites
+One small record per check, streamed to a JSON Lines file as it is produced
+"""
+
+import json
+import threading
+from collections import deque
+from datetime import datetime
+
+PASS = "PASS"
+FAIL = "FAIL"
+# Results kept in memory for the summary and the final report; the stream has all of them
+RECENT_RESULTS = 200
+RECENT_FAILURES = 50
+
+
+class CheckResult:
+    """Outcome of a single check"""
+
+    __slots__ = ('test', 'status', 'message', 'timestamp', 'response')
+
+    def __init__(self, test, success, message, response=None, timestamp=None):
+        self.test = test
+        self.status = PASS if success else FAIL
+        self.message = message
+        self.timestamp = timestamp or datetime.now().isoformat()
+        self.response = response
+
+    @property
+    def passed(self):
+        return self.status == PASS
+
+    def to_dict(self):
+        result = {
+            'test': self.test,
+            'status': self.status,
+            'message': self.message,
+            'timestamp': self.timestamp
+        }
+        if self.response:
+            result['response'] = self.response
+        return result
+
+
+class JsonLinesSink:
+    """Append records to a file or named pipe, one JSON object per line.
+
+    Every line is flushed as it is written, so a killed run leaves every
+    completed record behind. The file is truncated when first opened and
+    reopened for appending if records arrive after close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lines = 0
+        self._file = None
+        self._opened = False
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a' if self._opened else 'w')
+                self._opened = True
+            self._file.write(line)
+            self._file.flush()
+            self.lines += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ResultLog:
+    """Results of one suite run, appended from any worker thread.
+
+    Only the counts and the most recent results stay in memory; with a sink
+    every result is also streamed out as it is logged.
+    """
+
+    def __init__(self, sink=None, keep=RECENT_RESULTS, keep_failures=RECENT_FAILURES):
+        self._lock = threading.Lock()
+        self.sink = sink
+        self.recent = deque(maxlen=keep)
+        self.recent_failures = deque(maxlen=keep_failures)
+        self.passed = 0
+        self.failed = 0
+
+    def add(self, result):
+        """Store a result, stream it and print its line"""
+        with self._lock:
+            self.recent.append(result)
+            if result.passed:
+                self.passed += 1
+                print(f"✅ {result.test}: {result.message}")
+            else:
+                self.failed += 1
+                self.recent_failures.append(result)
+                print(f"❌ {result.test}: {result.message}")
+        if self.sink:
+            self.sink.write(result.to_dict())
+        return result
+
+    @property
+    def total(self):
+        return self.passed + self.failed
+
+    @property
+    def success_rate(self):
+        return self.passed / self.total * 100 if self.total else 0
+
+    @property
+    def truncated(self):
+        """Whether older results have dropped out of memory"""
+        return self.total > len(self.recent)
+
+    def failures(self):
+        return list(self.recent_failures)
+
+    def to_list(self):
+        return [result.to_dict() for result in self.recent]
+
+    def close(self):
+        if self.sink:
+            self.sink.close()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Soak testing for the HeadwayOS /api/status endpoints
+Runs a steady POST/GET mix for hours and tracks GET latency as status_checks grows
+"""
+
+import statistics
+import time
+
+import requests
+
+from .load_generator import STATUS_GET, STATUS_POST, LoadGenerator
+
+SOAK_WINDOW = 60
+# GET /api/status returns at most this many documents (find({}).limit(1000))
+GET_LIMIT = 1000
+# The first windows form the baseline; a window drifts once its GET p50 exceeds it by DRIFT_THRESHOLD
+DRIFT_BASELINE_WINDOWS = 3
+DRIFT_THRESHOLD = 0.5
+# Drift is only reported when it persists, so one slow window is not enough
+DRIFT_CONSECUTIVE = 3
+
+
+def linear_fit(xs, ys):
+    """Least-squares slope and Pearson correlation, or (None, None) when undefined"""
+    if len(xs) < 2:
+        return None, None
+    try:
+        slope, _ = statistics.linear_regression(xs, ys)
+        correlation = statistics.correlation(xs, ys)
+    except statistics.StatisticsError:
+        return None, None
+    return slope, correlation
+
+
+class SoakTest:
+    """Steady-rate load in fixed time windows.
+
+    Each window is a LoadGenerator run of window seconds. Between windows one
+    GET counts the documents the endpoint returns; the collection size is that
+    count plus every successful POST since, which stays a lower bound once the
+    collection outgrows GET_LIMIT. Every window is written to sink as it ends.
+    """
+
+    def __init__(self, session, base_url, duration, window=SOAK_WINDOW, rate=20, concurrency=4,
+                 post_ratio=0.2, timeout=10, sink=None):
+        self.session = session
+        self.base_url = base_url
+        self.duration = duration
+        self.window = window
+        self.rate = rate
+        self.concurrency = concurrency
+        self.post_ratio = post_ratio
+        self.timeout = timeout
+        self.sink = sink
+        self.windows = []
+
+    def _returned_count(self):
+        """Number of documents GET /api/status returns right now"""
+        try:
+            response = self.session.get(f"{self.base_url}/status", timeout=self.timeout)
+            if response.status_code == 200:
+                return len(response.json())
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        return None
+
+    def _window_record(self, index, started, report, collection, returned):
+        get = report['routes'][STATUS_GET]
+        post = report['routes'][STATUS_POST]
+        return {
+            'window': index,
+            'offset_s': round(started, 1),
+            'elapsed_s': round(report['elapsed'], 1),
+            'requests': report['requests'],
+            'throughput': report['throughput'],
+            'error_rate': report['error_rate'],
+            'collection_estimate': collection,
+            'get_returned': returned,
+            'get_requests': get['requests'],
+            'get_p50_ms': get['p50_ms'],
+            'get_p95_ms': get['p95_ms'],
+            'get_p99_ms': get['p99_ms'],
+            'post_requests': post['requests'],
+            'post_p50_ms': post['p50_ms'],
+            'post_p99_ms': post['p99_ms']
+        }
+
+    def run(self):
+        """Run every window and return the soak report"""
+        initial = self._returned_count()
+        collection = initial or 0
+        exact = initial is not None and initial < GET_LIMIT
+
+        start = time.perf_counter()
+        deadline = start + self.duration
+        index = 0
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            started = time.perf_counter() - start
+            generator = LoadGenerator(
+                self.session,
+                self.base_url,
+                duration=min(self.window, remaining),
+                concurrency=self.concurrency,
+                rate=self.rate,
+                post_ratio=self.post_ratio,
+                timeout=self.timeout,
+                client_name="HeadwayOS_Soak_Client"
+            )
+            report = generator.run()
+            collection += report['routes'][STATUS_POST]['statuses'].get('200', 0)
+            record = self._window_record(index, started, report, collection, self._returned_count())
+
+            self.windows.append(record)
+            if self.sink:
+                self.sink.write(record)
+            print_soak_window(record)
+            index += 1
+
+        return {
+            'config': {
+                'duration': self.duration,
+                'window': self.window,
+                'rate': self.rate,
+                'concurrency': self.concurrency,
+                'post_ratio': self.post_ratio
+            },
+            'elapsed': time.perf_counter() - start,
+            'initial_returned': initial,
+            'collection_exact': exact,
+            'drift': detect_drift(self.windows),
+            'windows': self.windows
+        }
+
+
+def detect_drift(windows, metric='get_p50_ms', baseline_windows=DRIFT_BASELINE_WINDOWS,
+                 threshold=DRIFT_THRESHOLD, consecutive=DRIFT_CONSECUTIVE):
+    """Compare every window with the first ones and fit latency against collection size.
+
+    onset is the first window of the first run of consecutive windows above the
+    baseline; collection_at_onset is where the GET path started to degrade.
+    """
+    result = {
+        'metric': metric,
+        'baseline_ms': None,
+        'limit_ms': None,
+        'drifted': False,
+        'onset_window': None,
+        'collection_at_onset': None,
+        'ms_per_1000_docs': None,
+        'correlation': None
+    }
+    measured = [w for w in windows if w['get_requests']]
+    if len(measured) <= baseline_windows:
+        return result
+
+    baseline = statistics.median(w[metric] for w in measured[:baseline_windows])
+    limit = baseline * (1 + threshold)
+    result['baseline_ms'] = baseline
+    result['limit_ms'] = limit
+
+    streak = []
+    for window in measured[baseline_windows:]:
+        streak = streak + [window] if window[metric] > limit else []
+        if len(streak) >= consecutive:
+            result['drifted'] = True
+            result['onset_window'] = streak[0]['window']
+            result['collection_at_onset'] = streak[0]['collection_estimate']
+            break
+
+    slope, correlation = linear_fit(
+        [w['collection_estimate'] for w in measured],
+        [w[metric] for w in measured]
+    )
+    if slope is not None:
+        result['ms_per_1000_docs'] = slope * 1000
+        result['correlation'] = correlation
+    return result
+
+
+def print_soak_window(window):
+    """Print one soak window as a progress line"""
+    print(f"🕐 Window {window['window']} (+{window['offset_s']:.0f}s): "
+          f"GET p50 {window['get_p50_ms']:.1f}ms p99 {window['get_p99_ms']:.1f}ms, "
+          f"POST p50 {window['post_p50_ms']:.1f}ms, ~{window['collection_estimate']} docs "
+          f"(GET returned {window['get_returned']}), {window['throughput']:.1f} req/s, "
+          f"{window['error_rate']:.2f}% errors")
+
+
+def print_soak_report(report):
+    """Print a soak report in the suite summary format"""
+    drift = report['drift']
+    windows = report['windows']
+    print("\n" + "=" * 60)
+    print("📊 SOAK TEST SUMMARY")
+    print("=" * 60)
+    print(f"⏱️  Duration: {report['elapsed']:.0f}s in {len(windows)} window(s)")
+    if windows:
+        bound = "" if report['collection_exact'] else "at least "
+        print(f"🗄️  status_checks: {bound}{windows[-1]['collection_estimate']} documents at the end")
+    if drift['baseline_ms'] is None:
+        print("📉 Drift: not enough windows to judge")
+        return
+    print(f"📉 GET /api/status p50 baseline {drift['baseline_ms']:.1f}ms, limit {drift['limit_ms']:.1f}ms")
+    if drift['ms_per_1000_docs'] is not None:
+        print(f"   {drift['ms_per_1000_docs']:+.2f}ms per 1000 documents (r = {drift['correlation']:.2f})")
+    if drift['drifted']:
+        print(f"❌ Drift from window {drift['onset_window']}, at ~{drift['collection_at_onset']} documents")
+    else:
+        print("✅ No sustained drift")
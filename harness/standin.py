@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+In-memory stand-in for the HeadwayOS API route (app/api/[[...path]]/route.js)
+Serves /api/root, /api/status GET/POST, 404s and CORS preflight without Node or MongoDB
+"""
+
+import argparse
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_PREFIX = '/api'
+# GET /api/status returns at most this many documents, like find({}).limit(1000)
+STATUS_LIMIT = 1000
+
+
+def js_timestamp(moment=None):
+    """ISO timestamp the way JSON.stringify writes a JavaScript Date"""
+    moment = moment or datetime.now(timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
+
+
+def js_falsy(value):
+    """Whether a decoded JSON value is falsy in JavaScript"""
+    if value is None or value is False or value == "":
+        return True
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value == 0
+    return False
+
+
+def reject_constant(name):
+    # JSON.parse rejects NaN and Infinity, which json.loads accepts by default
+    raise ValueError(f"Unexpected token {name}")
+
+
+class StandInAPI:
+    """Handler implementing the route.js contract on an in-memory status_checks list.
+
+    Call it as handler(method, path, headers, body) -> (status, headers, body),
+    which is what InProcessAdapter expects; serve() puts it behind http.server.
+    """
+
+    def __init__(self, cors_origin=None):
+        self.cors_origin = cors_origin or os.environ.get('CORS_ORIGINS', '*')
+        self.status_checks = []
+        self._lock = threading.Lock()
+
+    def cors_headers(self):
+        return {
+            'Access-Control-Allow-Origin': self.cors_origin,
+            'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+            'Access-Control-Allow-Credentials': 'true'
+        }
+
+    def json_response(self, data, status=200):
+        headers = {'Content-Type': 'application/json'}
+        headers.update(self.cors_headers())
+        return status, headers, json.dumps(data, separators=(',', ':'))
+
+    def __call__(self, method, path, headers, body):
+        path = path.split('?', 1)[0]
+        if path != API_PREFIX and not path.startswith(API_PREFIX + '/'):
+            return 404, {'Content-Type': 'text/plain'}, "Not Found"
+
+        method = method.upper()
+        if method == 'OPTIONS':
+            return 200, self.cors_headers(), b""
+
+        route = '/' + '/'.join(part for part in path[len(API_PREFIX):].split('/') if part)
+        if method == 'HEAD':
+            status, response_headers, _ = self.handle(route, 'GET', body)
+            return status, response_headers, b""
+        return self.handle(route, method, body)
+
+    def handle(self, route, method, body):
+        """Dispatch one API request, mirroring handleRoute"""
+        try:
+            if route in ('/root', '/') and method == 'GET':
+                return self.json_response({'message': "Hello World"})
+
+            if route == '/status' and method == 'POST':
+                data = json.loads(body or b"", parse_constant=reject_constant)
+                if data is None:
+                    raise TypeError("Cannot read properties of null (reading 'client_name')")
+                if not isinstance(data, dict) or js_falsy(data.get('client_name')):
+                    return self.json_response({'error': "client_name is required"}, status=400)
+                status_obj = {
+                    'id': str(uuid.uuid4()),
+                    'client_name': data['client_name'],
+                    'timestamp': js_timestamp()
+                }
+                with self._lock:
+                    self.status_checks.append(status_obj)
+                return self.json_response(status_obj)
+
+            if route == '/status' and method == 'GET':
+                with self._lock:
+                    status_checks = self.status_checks[:STATUS_LIMIT]
+                return self.json_response(status_checks)
+
+            return self.json_response({'error': f"Route {route} not found"}, status=404)
+
+        except (ValueError, TypeError):
+            # Bad JSON or a null body ends up in route.js's catch block
+            return self.json_response({'error': "Internal server error"}, status=500)
+
+    def reset(self):
+        with self._lock:
+            self.status_checks.clear()
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """http.server front end for a StandInAPI"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle the body waits for the delayed ACK (~40ms)
+    disable_nagle_algorithm = True
+    app = None
+
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, content = self.app(self.command, self.path, dict(self.headers), body)
+        if isinstance(content, str):
+            content = content.encode()
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_OPTIONS = do_HEAD = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(app=None, host='127.0.0.1', port=0):
+    """Serve app over HTTP on a background thread and return the server.
+
+    port 0 picks a free port; the bound one is server.server_address[1].
+    Stop it with server.shutdown().
+    """
+    handler = type('Handler', (StandInRequestHandler,), {'app': app or StandInAPI()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory stand-in for the HeadwayOS API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001)
+    args = parser.parse_args()
+
+    server = serve(host=args.host, port=args.port)
+    print(f"🧪 HeadwayOS API stand-in on http://{args.host}:{server.server_address[1]}{API_PREFIX}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
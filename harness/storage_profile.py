@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+localStorage write profiling for the HeadwayOS browser suites
+Hooks setItem and JSON.stringify in the page and measures what each scripted interaction writes
+"""
+
+# Per-interaction limits; a mock data change that crosses them is storage churn worth a look
+MAX_WRITES_PER_INTERACTION = 2
+MAX_BYTES_PER_INTERACTION = 32 * 1024
+
+HOOK_SCRIPT = """
+if (!window.__headwayStorage) {
+    var state = window.__headwayStorage = {active: false, record: null};
+    var setItem = Storage.prototype.setItem;
+    Storage.prototype.setItem = function (key, value) {
+        var start = performance.now();
+        try {
+            return setItem.apply(this, arguments);
+        } finally {
+            if (state.active) {
+                var record = state.record;
+                // localStorage keeps strings as UTF-16
+                var bytes = String(value).length * 2;
+                record.writes += 1;
+                record.bytes += bytes;
+                record.keys[key] = (record.keys[key] || 0) + bytes;
+                record.setItemMs += performance.now() - start;
+            }
+        }
+    };
+    var stringify = JSON.stringify;
+    JSON.stringify = function () {
+        var start = performance.now();
+        try {
+            return stringify.apply(JSON, arguments);
+        } finally {
+            if (state.active) {
+                state.record.stringifyCalls += 1;
+                state.record.stringifyMs += performance.now() - start;
+            }
+        }
+    };
+}
+"""
+
+BEGIN_AND_CLICK_SCRIPT = """
+var state = window.__headwayStorage;
+state.record = {writes: 0, bytes: 0, keys: {}, setItemMs: 0, stringifyCalls: 0, stringifyMs: 0};
+state.active = true;
+var start = performance.now();
+arguments[0].click();
+state.record.handlerMs = performance.now() - start;
+"""
+
+END_SCRIPT = """
+var state = window.__headwayStorage;
+state.active = false;
+var total = 0;
+for (var i = 0; i < localStorage.length; i++) {
+    var key = localStorage.key(i);
+    total += (key.length + localStorage.getItem(key).length) * 2;
+}
+state.record.storageBytes = total;
+return state.record;
+"""
+
+
+class StorageProfiler:
+    """Measure the localStorage writes and serialization each interaction causes.
+
+    install() hooks the current document; interact() clicks an element and,
+    once settle (a driver condition, e.g. mutations_settled) holds, returns
+    the writes, bytes written, per-key bytes, time in setItem and in
+    JSON.stringify, and the total size of localStorage afterwards.
+    """
+
+    def __init__(self, driver, waiter=None):
+        self.driver = driver
+        self.waiter = waiter
+        self.interactions = []
+
+    def install(self):
+        self.driver.execute_script(HOOK_SCRIPT)
+
+    def interact(self, kind, element, settle=None, label=None):
+        self.driver.execute_script(BEGIN_AND_CLICK_SCRIPT, element)
+        if settle and self.waiter:
+            self.waiter.until(f"{kind} storage sync", settle, required=False)
+        record = self.driver.execute_script(END_SCRIPT)
+        record = {
+            'kind': kind,
+            'label': label,
+            'writes': record['writes'],
+            'bytes': record['bytes'],
+            'keys': record['keys'],
+            'set_item_ms': record['setItemMs'],
+            'stringify_calls': record['stringifyCalls'],
+            'stringify_ms': record['stringifyMs'],
+            'handler_ms': record.get('handlerMs'),
+            'storage_bytes': record['storageBytes']
+        }
+        self.interactions.append(record)
+        return record
+
+    def summary(self):
+        """Per interaction kind: counts, means and maxima of writes, bytes and serialization time"""
+        kinds = {}
+        for record in self.interactions:
+            kinds.setdefault(record['kind'], []).append(record)
+        result = {}
+        for kind, records in kinds.items():
+            count = len(records)
+            result[kind] = {
+                'interactions': count,
+                'writes_per_interaction': sum(r['writes'] for r in records) / count,
+                'max_writes': max(r['writes'] for r in records),
+                'bytes_per_interaction': sum(r['bytes'] for r in records) / count,
+                'max_bytes': max(r['bytes'] for r in records),
+                'stringify_ms_per_interaction': sum(r['stringify_ms'] for r in records) / count,
+                'set_item_ms_per_interaction': sum(r['set_item_ms'] for r in records) / count,
+                'keys': sorted({key for r in records for key in r['keys']}),
+                'storage_bytes': records[-1]['storage_bytes']
+            }
+        return result
+
+
+def over_budget(summary, max_writes=MAX_WRITES_PER_INTERACTION, max_bytes=MAX_BYTES_PER_INTERACTION):
+    """Descriptions of every interaction kind that writes more than its budget"""
+    problems = []
+    for kind, stats in summary.items():
+        if stats['max_writes'] > max_writes:
+            problems.append(f"{kind} makes {stats['max_writes']} writes (> {max_writes})")
+        if stats['max_bytes'] > max_bytes:
+            problems.append(f"{kind} writes {stats['max_bytes'] / 1024:.1f}KB (> {max_bytes / 1024:.0f}KB)")
+    return problems
+
+
+def history_metrics(summary):
+    """Per-kind churn as {(endpoint, name): value} for the run history"""
+    metrics = {}
+    for kind, stats in summary.items():
+        endpoint = f"STORAGE {kind}"
+        metrics[(endpoint, 'storage.writes')] = stats['writes_per_interaction']
+        metrics[(endpoint, 'storage.write_bytes')] = stats['bytes_per_interaction']
+        metrics[(endpoint, 'storage.stringify_ms')] = stats['stringify_ms_per_interaction']
+    return metrics
+
+
+def print_storage_profile(summary):
+    """Print per-interaction storage churn in the suite summary format"""
+    if not summary:
+        return
+    print("💾 localStorage writes per interaction:")
+    for kind, stats in summary.items():
+        print(f"   • {kind}: {stats['writes_per_interaction']:.1f} write(s), "
+              f"{stats['bytes_per_interaction'] / 1024:.1f}KB, "
+              f"stringify {stats['stringify_ms_per_interaction']:.2f}ms, "
+              f"setItem {stats['set_item_ms_per_interaction']:.2f}ms "
+              f"over {stats['interactions']} interaction(s) ({', '.join(stats['keys']) or 'no keys'})")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Transports for the HeadwayOS test suites
+A transport owns the connection to the app under test and times every call into one LatencyRecorder
+"""
+
+import io
+import threading
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.response import HTTPResponse
+
+from .driver_pool import DRIVER_MAX_RSS_MB, DRIVER_MAX_USES, DRIVER_POOL_SIZE, DriverPool, print_driver_stats
+from .http_session import (
+    POOL_CONNECTIONS, POOL_MAXSIZE, TimedSession, build_session, connection_stats, print_connection_stats
+)
+from .latency import LatencyRecorder, instrument_driver
+
+IN_PROCESS_URL = "http://in-process"
+
+
+class HttpTransport:
+    """Keep-alive requests session against a running server"""
+
+    def __init__(self, headers=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 retries=None, recorder=None):
+        self.session = build_session(
+            headers=headers,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            retries=retries,
+            recorder=recorder
+        )
+        self.latency = self.session.latency
+        self.payload = self.session.payload
+        self._final_stats = None
+
+    def stats(self):
+        # Closing the session drops its pools, so the numbers are kept from close()
+        if self._final_stats is not None:
+            return self._final_stats
+        return {'connections': connection_stats(self.session)}
+
+    def print_stats(self):
+        print_connection_stats(self.stats()['connections'])
+
+    def close(self):
+        if self._final_stats is None:
+            self._final_stats = self.stats()
+            self.session.close()
+
+
+class InProcessAdapter(BaseAdapter):
+    """requests adapter that hands each request to a Python handler instead of a socket.
+
+    handler(method, path, headers, body) returns (status, headers, body), where
+    path includes the query string and body is bytes or str.
+    """
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        parts = urlsplit(request.url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        body = request.body.encode() if isinstance(request.body, str) else request.body
+
+        status, headers, content = self.handler(request.method, path, dict(request.headers), body or b"")
+        if isinstance(content, str):
+            content = content.encode()
+        with self._lock:
+            self.requests += 1
+
+        reason = HTTPStatus(status).phrase if status in HTTPStatus._value2member_map_ else ""
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers=headers,
+            status=status,
+            reason=reason,
+            preload_content=False
+        )
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = raw
+        response.reason = reason
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class InProcessTransport:
+    """Session whose requests to base_url are served by a handler in this process"""
+
+    def __init__(self, handler, base_url=IN_PROCESS_URL, headers=None, recorder=None):
+        self.base_url = base_url.rstrip('/')
+        self.adapter = InProcessAdapter(handler)
+        self.session = TimedSession(recorder)
+        if headers:
+            self.session.headers.update(headers)
+        self.session.mount(self.base_url, self.adapter)
+        self.latency = self.session.latency
+        self.payload = self.session.payload
+
+    def stats(self):
+        return {'in_process': {'handler': type(self.adapter.handler).__name__, 'requests': self.adapter.requests}}
+
+    def print_stats(self):
+        stats = self.stats()['in_process']
+        print(f"🧪 In-process: {stats['requests']} requests served by {stats['handler']}")
+
+    def close(self):
+        self.session.close()
+
+
+class WebDriverTransport:
+    """Pool of pre-warmed browser sessions with every WebDriver command timed.
+
+    factory creates a bare driver; it is called on pool start and whenever a
+    session is recycled. Selenium itself is only needed by the factory.
+    """
+
+    def __init__(self, factory, pool_size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES,
+                 max_rss_mb=DRIVER_MAX_RSS_MB, recorder=None):
+        self.factory = factory
+        self.latency = recorder if recorder is not None else LatencyRecorder()
+        # Page payloads are not visible through WebDriver
+        self.payload = None
+        self.pool = DriverPool(self._create, size=pool_size, max_uses=max_uses, max_rss_mb=max_rss_mb)
+        self._final_stats = None
+
+    def _create(self):
+        return instrument_driver(self.factory(), self.latency)
+
+    @property
+    def size(self):
+        return self.pool.size
+
+    def start(self):
+        self.pool.start()
+
+    def acquire(self):
+        return self.pool.acquire()
+
+    def stats(self):
+        if self._final_stats is not None:
+            return self._final_stats
+        return {'drivers': self.pool.stats()}
+
+    def print_stats(self):
+        print_driver_stats(self.stats()['drivers'])
+
+    def close(self):
+        if self._final_stats is None:
+            self._final_stats = self.stats()
+            self.pool.close()
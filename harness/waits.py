@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Condition-driven waiting for the HeadwayOS browser suites
+Polls for DOM and network conditions instead of sleeping, and records how long each wait took
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException
+)
+from selenium.webdriver.common.by import By
+
+from .dom_probe import text_xpath
+
+DEFAULT_TIMEOUT = 10.0
+MIN_TIMEOUT = 2.0
+POLL_INTERVAL = 0.05
+# Once a condition has been met a few times, its timeout becomes this multiple of its p95
+TIMEOUT_FACTOR = 3.0
+ADAPTIVE_MIN_SAMPLES = 3
+# Most recent durations kept per condition for the adaptive timeout and the summary
+WAIT_SAMPLES = 200
+NETWORK_IDLE_MS = 500
+MUTATION_QUIET_MS = 100
+
+
+def text_present(text):
+    """Some element's own text contains text"""
+    xpath = text_xpath(text)
+    return lambda driver: driver.find_elements(By.XPATH, xpath)
+
+
+def text_absent(text):
+    """No element's own text contains text"""
+    xpath = text_xpath(text)
+    return lambda driver: not driver.find_elements(By.XPATH, xpath)
+
+
+def document_ready():
+    """The document and its subresources have finished loading"""
+    return lambda driver: driver.execute_script("return document.readyState;") == 'complete'
+
+
+def network_idle(idle_ms=NETWORK_IDLE_MS):
+    """The document is loaded and no resource has finished loading for idle_ms"""
+    script = """
+        if (document.readyState !== 'complete') return false;
+        var last = 0;
+        performance.getEntriesByType('resource').forEach(function (entry) {
+            last = Math.max(last, entry.responseEnd);
+        });
+        return performance.now() - last >= arguments[0];
+    """
+    return lambda driver: driver.execute_script(script, idle_ms)
+
+
+def watch_mutations(driver):
+    """Start counting DOM mutations; pair with mutations_settled() after an interaction"""
+    driver.execute_script("""
+        if (window.__waitObserver) window.__waitObserver.disconnect();
+        window.__waitMutations = {count: 0, last: 0};
+        window.__waitObserver = new MutationObserver(function (records) {
+            window.__waitMutations.count += records.length;
+            window.__waitMutations.last = performance.now();
+        });
+        window.__waitObserver.observe(document.body, {
+            subtree: true, childList: true, attributes: true, characterData: true
+        });
+    """)
+
+
+def mutations_settled(quiet_ms=MUTATION_QUIET_MS):
+    """The DOM has changed since watch_mutations() and then stayed quiet for quiet_ms"""
+    script = """
+        var state = window.__waitMutations;
+        return !!state && state.count > 0 && performance.now() - state.last >= arguments[0];
+    """
+    return lambda driver: driver.execute_script(script, quiet_ms)
+
+
+class WaitRecorder:
+    """Duration of every wait, grouped by condition name and shared across sessions"""
+
+    def __init__(self, factor=TIMEOUT_FACTOR, min_timeout=MIN_TIMEOUT, keep=WAIT_SAMPLES):
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.keep = keep
+        self.samples = {}
+        self.met = {}
+        self.timeouts = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, duration_ms, satisfied):
+        with self._lock:
+            if satisfied:
+                self.samples.setdefault(name, deque(maxlen=self.keep)).append(duration_ms)
+                self.met[name] = self.met.get(name, 0) + 1
+            else:
+                self.timeouts[name] = self.timeouts.get(name, 0) + 1
+
+    def timeout_for(self, name, default):
+        """Adaptive timeout: factor x the observed p95, between min_timeout and default"""
+        with self._lock:
+            samples = sorted(self.samples.get(name, ()))
+        if len(samples) < ADAPTIVE_MIN_SAMPLES:
+            return default
+        p95 = samples[max(math.ceil(0.95 * len(samples)) - 1, 0)] / 1000
+        return min(default, max(self.min_timeout, p95 * self.factor))
+
+    def summary(self):
+        """Per-condition wait statistics, JSON friendly"""
+        with self._lock:
+            names = sorted(set(self.samples) | set(self.timeouts))
+            result = {}
+            for name in names:
+                samples = sorted(self.samples.get(name, ()))
+                result[name] = {
+                    'waits': self.met.get(name, 0) + self.timeouts.get(name, 0),
+                    'timeouts': self.timeouts.get(name, 0),
+                    'p50_ms': round(samples[len(samples) // 2], 1) if samples else None,
+                    'max_ms': round(samples[-1], 1) if samples else None
+                }
+            return result
+
+
+class Waiter:
+    """Polls a condition against one driver until it holds or its timeout runs out.
+
+    Optional waits use the recorder's adaptive timeout. Required waits always
+    get the full default, so a cold server or a recompile after a few fast
+    runs is not reported as a failure.
+    """
+
+    def __init__(self, driver, recorder, default_timeout=DEFAULT_TIMEOUT, poll=POLL_INTERVAL):
+        self.driver = driver
+        self.recorder = recorder
+        self.default_timeout = default_timeout
+        self.poll = poll
+        self.last_ms = 0.0
+
+    def until(self, name, condition, timeout=None, required=True):
+        """Wait for condition; returns its value, or None for an optional wait that timed out"""
+        if not timeout:
+            timeout = self.default_timeout if required else self.recorder.timeout_for(name, self.default_timeout)
+        start = time.perf_counter()
+        deadline = start + timeout
+        while True:
+            try:
+                value = condition(self.driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                value = None
+            now = time.perf_counter()
+            self.last_ms = (now - start) * 1000
+            if value:
+                self.recorder.record(name, self.last_ms, True)
+                return value
+            if now >= deadline:
+                self.recorder.record(name, self.last_ms, False)
+                if required:
+                    raise TimeoutException(f"Timed out after {timeout:.1f}s waiting for {name}")
+                return None
+            time.sleep(min(self.poll, deadline - now))
+
+
+def print_wait_stats(summary):
+    """Print wait statistics in the suite summary format"""
+    if not summary:
+        return
+    print("⏳ Waits:")
+    for name, stats in sorted(summary.items(), key=lambda item: -(item[1]['max_ms'] or 0)):
+        timing = f"p50 {stats['p50_ms']}ms, max {stats['max_ms']}ms" if stats['p50_ms'] is not None else "never met"
+        print(f"   • {name}: {stats['waits']} wait(s), {timing}, {stats['timeouts']} timeout(s)")
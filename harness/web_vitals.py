@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Page load metrics for the HeadwayOS browser suites
+Captures Navigation Timing, paint timings, layout shifts, long tasks, hydration and localStorage use per page load
+"""
+
+# "Good" thresholds from the Core Web Vitals definitions
+FCP_BUDGET_MS = 1800
+LCP_BUDGET_MS = 2500
+CLS_BUDGET = 0.1
+# Main-thread work beyond this per task counts as blocking time
+LONG_TASK_BLOCKING_MS = 50
+# Storage calls kept per page load; the counters keep going past it
+MAX_STORAGE_OPS = 200
+
+# Installed with Page.addScriptToEvaluateOnNewDocument, so it runs in every new
+# document before any of the page's own scripts
+OBSERVER_SCRIPT = """
+(function () {
+    if (window.__headwayVitals) return;
+    var vitals = window.__headwayVitals = {
+        paint: {}, lcp: null, shifts: [], longTasks: [], hydrationMs: null,
+        storage: {ops: [], reads: 0, writes: 0, writeBytes: 0, ms: 0, firstMs: null, lastMs: null}
+    };
+
+    function observe(type, callback) {
+        try {
+            new PerformanceObserver(function (list) {
+                list.getEntries().forEach(callback);
+            }).observe({type: type, buffered: true});
+        } catch (e) {}
+    }
+    observe('paint', function (entry) { vitals.paint[entry.name] = entry.startTime; });
+    observe('largest-contentful-paint', function (entry) {
+        vitals.lcp = {startTime: entry.startTime, size: entry.size,
+                      element: entry.element ? entry.element.tagName : null};
+    });
+    observe('layout-shift', function (entry) {
+        if (!entry.hadRecentInput) vitals.shifts.push({startTime: entry.startTime, value: entry.value});
+    });
+    observe('longtask', function (entry) {
+        vitals.longTasks.push({startTime: entry.startTime, duration: entry.duration});
+    });
+
+    // React marks every hydrated DOM node with a __reactFiber$<random> key
+    function hydrated() {
+        var node = document.body;
+        return !!node && Object.keys(node).some(function (key) {
+            return key.indexOf('__reactFiber$') === 0;
+        });
+    }
+    function checkHydration() {
+        if (vitals.hydrationMs !== null) return;
+        if (hydrated()) {
+            vitals.hydrationMs = performance.now();
+        } else {
+            requestAnimationFrame(checkHydration);
+        }
+    }
+    requestAnimationFrame(checkHydration);
+    new MutationObserver(function (mutations, observer) {
+        checkHydration();
+        if (vitals.hydrationMs !== null) observer.disconnect();
+    }).observe(document, {childList: true, subtree: true, attributes: true});
+
+    // Time every localStorage call the page makes
+    function wrap(name, write) {
+        var original = Storage.prototype[name];
+        Storage.prototype[name] = function (key, value) {
+            var start = performance.now();
+            try {
+                return original.apply(this, arguments);
+            } finally {
+                var end = performance.now();
+                var storage = vitals.storage;
+                storage.ms += end - start;
+                storage.firstMs = storage.firstMs === null ? start : storage.firstMs;
+                storage.lastMs = end;
+                if (write) {
+                    storage.writes += 1;
+                    storage.writeBytes += String(value).length * 2;
+                } else {
+                    storage.reads += 1;
+                }
+                if (storage.ops.length < %(max_ops)d) {
+                    storage.ops.push({op: name, key: String(key), startTime: start, duration: end - start,
+                                      bytes: write ? String(value).length * 2 : null});
+                }
+            }
+        };
+    }
+    wrap('getItem', false);
+    wrap('setItem', true);
+})();
+""" % {'max_ops': MAX_STORAGE_OPS}
+
+COLLECT_SCRIPT = """
+var vitals = window.__headwayVitals;
+var nav = performance.getEntriesByType('navigation')[0];
+return {
+    installed: !!vitals,
+    url: location.pathname,
+    navigation: nav ? {
+        ttfb: nav.responseStart,
+        response_end: nav.responseEnd,
+        dom_interactive: nav.domInteractive,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+        transfer_bytes: nav.transferSize,
+        body_bytes: nav.decodedBodySize
+    } : null,
+    vitals: vitals ? JSON.parse(JSON.stringify(vitals)) : null,
+    now: performance.now()
+};
+"""
+
+
+def install_observer(driver):
+    """Register the observer for every future document; False when the driver has no CDP"""
+    execute_cdp_cmd = getattr(driver, 'execute_cdp_cmd', None)
+    if execute_cdp_cmd is None:
+        return False
+    execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': OBSERVER_SCRIPT})
+    return True
+
+
+def cumulative_layout_shift(shifts, gap_ms=1000, window_ms=5000):
+    """Largest session window of layout shifts: gaps under 1s, windows up to 5s"""
+    best = current = 0.0
+    window_start = previous = None
+    for shift in sorted(shifts, key=lambda s: s['startTime']):
+        start = shift['startTime']
+        if previous is None or start - previous > gap_ms or start - window_start > window_ms:
+            current = 0.0
+            window_start = start
+        current += shift['value']
+        previous = start
+        best = max(best, current)
+    return best
+
+
+def summarize(raw):
+    """Turn the collected browser data into flat page load metrics in ms"""
+    vitals = raw.get('vitals') or {}
+    navigation = raw.get('navigation') or {}
+    paint = vitals.get('paint', {})
+    fcp = paint.get('first-contentful-paint')
+    long_tasks = vitals.get('longTasks', [])
+    storage = vitals.get('storage') or {}
+    lcp = vitals.get('lcp')
+
+    blocking = sum(
+        max(task['duration'] - LONG_TASK_BLOCKING_MS, 0.0) for task in long_tasks
+        if fcp is None or task['startTime'] >= fcp
+    )
+    summary = {
+        'path': raw.get('url'),
+        'installed': raw.get('installed', False),
+        'ttfb_ms': navigation.get('ttfb'),
+        'dom_content_loaded_ms': navigation.get('dom_content_loaded'),
+        'load_ms': navigation.get('load'),
+        'transfer_bytes': navigation.get('transfer_bytes'),
+        'fp_ms': paint.get('first-paint'),
+        'fcp_ms': fcp,
+        'lcp_ms': lcp['startTime'] if lcp else None,
+        'lcp_element': lcp['element'] if lcp else None,
+        'cls': round(cumulative_layout_shift(vitals.get('shifts', [])), 4),
+        'long_tasks': len(long_tasks),
+        'long_task_ms': sum(task['duration'] for task in long_tasks),
+        'longest_task_ms': max((task['duration'] for task in long_tasks), default=0.0),
+        'total_blocking_ms': blocking,
+        'hydration_ms': vitals.get('hydrationMs'),
+        'storage': {
+            'reads': storage.get('reads', 0),
+            'writes': storage.get('writes', 0),
+            'write_bytes': storage.get('writeBytes', 0),
+            'ms': storage.get('ms', 0.0),
+            'first_ms': storage.get('firstMs'),
+            'last_ms': storage.get('lastMs'),
+            'before_fcp': storage.get('firstMs') is not None and fcp is not None and storage['firstMs'] < fcp,
+            'ops': storage.get('ops', [])
+        }
+    }
+    if summary['hydration_ms'] is not None and storage.get('lastMs') is not None:
+        # How long after hydration the mount-time localStorage sync finished
+        summary['storage']['after_hydration_ms'] = storage['lastMs'] - summary['hydration_ms']
+    return summary
+
+
+def collect(driver):
+    """Page load metrics of the document currently loaded in driver"""
+    return summarize(driver.execute_script(COLLECT_SCRIPT))
+
+
+def over_budget(summary, fcp_ms=FCP_BUDGET_MS, lcp_ms=LCP_BUDGET_MS, cls=CLS_BUDGET):
+    """Descriptions of every metric outside its budget"""
+    problems = []
+    if summary['fcp_ms'] is not None and summary['fcp_ms'] > fcp_ms:
+        problems.append(f"FCP {summary['fcp_ms']:.0f}ms > {fcp_ms}ms")
+    if summary['lcp_ms'] is not None and summary['lcp_ms'] > lcp_ms:
+        problems.append(f"LCP {summary['lcp_ms']:.0f}ms > {lcp_ms}ms")
+    if summary['cls'] > cls:
+        problems.append(f"CLS {summary['cls']:.3f} > {cls}")
+    return problems
+
+
+def _ms(value):
+    return f"{value:.0f}ms" if value is not None else "n/a"
+
+
+def format_vitals(summary):
+    """One-line description of a page load"""
+    return (f"TTFB {_ms(summary['ttfb_ms'])}, FCP {_ms(summary['fcp_ms'])}, LCP {_ms(summary['lcp_ms'])}, "
+            f"CLS {summary['cls']:.3f}, hydrated {_ms(summary['hydration_ms'])}, "
+            f"TBT {_ms(summary['total_blocking_ms'])} over {summary['long_tasks']} long task(s)")
+
+
+def print_vitals(pages):
+    """Print page load metrics in the suite summary format"""
+    if not pages:
+        return
+    print("🎨 Page load (first visit, empty localStorage):")
+    for path, summary in pages.items():
+        print(f"   • {path}: {format_vitals(summary)}")
+        storage = summary['storage']
+        if storage['reads'] or storage['writes']:
+            line = (f"     localStorage {storage['reads']} read(s), {storage['writes']} write(s) "
+                    f"({storage['write_bytes'] / 1024:.1f}KB) in {storage['ms']:.1f}ms, "
+                    f"done at {_ms(storage['last_ms'])}")
+            if 'after_hydration_ms' in storage:
+                line += f", {storage['after_hydration_ms']:.0f}ms after hydration"
+            print(line)
@@ -0,0 +1,42 @@
+import unittest
+
+from harness.load_generator import LoadGenerator
+from harness.multiprocess_load import MultiProcessLoad
+
+
+def schedule(config, start):
+    """Send slots a process with this config claims when its run starts at start"""
+    generator = LoadGenerator(
+        None, config['base_url'],
+        duration=config['duration'],
+        concurrency=config['concurrency'],
+        rate=config['rate'],
+        arrivals=config['arrivals'],
+        phase=config['phase']
+    )
+    generator._start_schedule(start)
+    slots = []
+    while True:
+        slot = generator._next_slot()
+        if slot >= generator._deadline:
+            return slots
+        slots.append(slot)
+
+
+class ConstantArrivalScheduleTest(unittest.TestCase):
+
+    def test_merged_slots_are_evenly_spaced(self):
+        # Uneven worker split on purpose: 5 workers over 3 processes
+        load = MultiProcessLoad('http://127.0.0.1:1/api', duration=2, concurrency=5, rate=90,
+                                processes=3, arrivals='constant')
+        slots = sorted(slot for config in load._configs() for slot in schedule(config, 100.0))
+        # Accumulated slot times can land a hair before the deadline and add one slot
+        self.assertAlmostEqual(len(slots), 180, delta=1)
+        self.assertAlmostEqual(slots[0], 100.0)
+        gaps = [later - earlier for earlier, later in zip(slots, slots[1:])]
+        for gap in gaps:
+            self.assertAlmostEqual(gap, 1 / 90, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import threading
+import time
+import unittest
+
+from harness.async_runner import AsyncTestRunner
+
+
+class AsyncTestRunnerTest(unittest.TestCase):
+
+    def test_diamond_dependencies_run_in_order(self):
+        # top -> (left, right) -> bottom
+        finished = []
+        lock = threading.Lock()
+
+        def check(name, delay=0.0):
+            def run():
+                time.sleep(delay)
+                with lock:
+                    finished.append(name)
+                return name
+            return run
+
+        runner = AsyncTestRunner(max_concurrency=4)
+        runner.add(check('bottom'), name='bottom', after=['left', 'right'])
+        runner.add(check('left', 0.05), name='left', after=['top'])
+        runner.add(check('right', 0.01), name='right', after=['top'])
+        runner.add(check('top', 0.02), name='top')
+        results = runner.run()
+
+        self.assertEqual(results, {name: name for name in ('top', 'left', 'right', 'bottom')})
+        self.assertEqual(finished[0], 'top')
+        self.assertEqual(finished[-1], 'bottom')
+        self.assertEqual(set(finished[1:3]), {'left', 'right'})
+
+    def test_cycle_is_rejected(self):
+        runner = AsyncTestRunner()
+        runner.add(lambda: None, name='a', after=['c'])
+        runner.add(lambda: None, name='b', after=['a'])
+        runner.add(lambda: None, name='c', after=['b'])
+        runner.add(lambda: None, name='free')
+        with self.assertRaisesRegex(ValueError, "Dependency cycle"):
+            runner.run()
+
+    def test_unknown_dependency_is_rejected(self):
+        runner = AsyncTestRunner()
+        runner.add(lambda: None, name='a', after=['missing'])
+        with self.assertRaisesRegex(ValueError, "Unknown dependencies"):
+            runner.run()
+
+    def test_concurrency_limit(self):
+        limit = 3
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def check():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        runner = AsyncTestRunner(max_concurrency=limit)
+        for i in range(10):
+            runner.add(check, name=f"check_{i}")
+        runner.run()
+        self.assertEqual(peak, limit)
+
+    def test_errors_go_to_on_error_and_dependents_still_run(self):
+        errors = []
+        runner = AsyncTestRunner(on_error=lambda name, error: errors.append((name, type(error))))
+
+        def fail():
+            raise RuntimeError("boom")
+
+        runner.add(fail, name='first')
+        runner.add(lambda: 'ran', name='second', after=['first'])
+        results = runner.run()
+        self.assertEqual(errors, [('first', RuntimeError)])
+        self.assertEqual(results['second'], 'ran')
+
+    def test_max_concurrency_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            AsyncTestRunner(max_concurrency=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
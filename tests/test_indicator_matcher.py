@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from harness.indicator_matcher import IndicatorRegistry
+
+
+def naive_offsets(text, pattern):
+    """Every start offset of pattern in text, overlapping ones included"""
+    return [i for i in range(len(text) - len(pattern) + 1) if text[i:i + len(pattern)] == pattern]
+
+
+class IndicatorRegistryTest(unittest.TestCase):
+
+    def assert_matches_naive(self, registry, text):
+        scan = registry.scan(text)
+        for indicators in registry.groups.values():
+            for indicator in indicators:
+                expected = naive_offsets(text, indicator)
+                self.assertEqual(scan.offsets.get(indicator, []), expected, indicator)
+                self.assertEqual(scan.count(indicator), len(expected), indicator)
+
+    def test_nested_and_overlapping_patterns(self):
+        registry = IndicatorRegistry()
+        registry.register('words', ['he', 'she', 'hers', 'his'])
+        scan = registry.scan('ushers shehishers')
+        self.assertEqual(scan.offsets['he'], [2, 8, 13])
+        self.assertEqual(scan.offsets['she'], [1, 7, 12])
+        self.assertEqual(scan.offsets['hers'], [2, 13])
+        self.assertEqual(scan.offsets['his'], [10])
+        self.assert_matches_naive(registry, 'ushers shehishers')
+
+    def test_self_overlapping_pattern(self):
+        registry = IndicatorRegistry()
+        registry.register('runs', ['aa', 'aaa'])
+        scan = registry.scan('aaaaa')
+        self.assertEqual(scan.offsets['aa'], [0, 1, 2, 3])
+        self.assertEqual(scan.offsets['aaa'], [0, 1, 2])
+
+    def test_groups_share_indicators(self):
+        registry = IndicatorRegistry()
+        registry.register('dashboard', ['WELCOME BACK', 'Aarav', 'MATCH'])
+        registry.register('mock_data', ['Aarav', '78%'])
+        scan = registry.scan('<h1>WELCOME BACK, Aarav</h1><p>MATCH 78%</p>')
+        self.assertEqual(scan.found('dashboard'), ['WELCOME BACK', 'Aarav', 'MATCH'])
+        self.assertEqual(scan.found('mock_data'), ['Aarav', '78%'])
+        self.assertEqual(scan.missing('mock_data'), [])
+        self.assertEqual(scan.group_summary('mock_data')['Aarav'], {'count': 1, 'offsets': [18]})
+
+    def test_missing_and_empty_indicators(self):
+        registry = IndicatorRegistry()
+        registry.register('loading', ['Loading your dashboard', ''])
+        scan = registry.scan('<div>dashboard</div>')
+        self.assertEqual(scan.found('loading'), [])
+        self.assertEqual(scan.missing('loading'), ['Loading your dashboard', ''])
+
+    def test_random_texts_match_naive_scan(self):
+        rng = random.Random(5)
+        registry = IndicatorRegistry()
+        patterns = {''.join(rng.choice('abc') for _ in range(rng.randint(1, 4))) for _ in range(12)}
+        registry.register('random', sorted(patterns))
+        for _ in range(50):
+            text = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 200)))
+            self.assert_matches_naive(registry, text)
+
+    def test_register_replaces_compiled_patterns(self):
+        registry = IndicatorRegistry()
+        registry.register('a', ['x'])
+        self.assertEqual(registry.scan('xyz').count('x'), 1)
+        registry.register('b', ['yz'])
+        self.assertEqual(registry.scan('xyz').count('yz'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
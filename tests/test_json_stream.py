@@ -0,0 +1,114 @@
+import json
+import random
+import unittest
+
+from harness.json_stream import ArrayStream, stream_json_array
+
+DOCUMENT = [
+    {'id': 1, 'title': 'plain', 'tags': ['a', 'b'], 'score': 12.5},
+    {'id': 2, 'title': 'brackets ] [ and , commas', 'nested': {'deep': [[], {}, [1, [2, [3]]]]}},
+    {'id': 3, 'title': 'escaped \\" quote and \\\\ backslash', 'empty': ''},
+    {'id': 4, 'title': 'unicode ünïcödé — 日本語 🚀', 'flag': True, 'missing': None},
+    'a bare string',
+    123456789,
+    -0.000125,
+    1.5e10,
+    True,
+    False,
+    None,
+    [],
+    {}
+]
+
+
+def chunked(data, sizes):
+    position = 0
+    for size in sizes:
+        if position >= len(data):
+            return
+        yield data[position:position + size]
+        position += size
+    if position < len(data):
+        yield data[position:]
+
+
+def collect(chunks):
+    items = []
+
+    def validate(item):
+        items.append(item)
+
+    stream = stream_json_array(chunks, validate=validate)
+    return stream, items
+
+
+class ArrayStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        self.body = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode('utf-8')
+
+    def test_one_byte_chunks(self):
+        stream, items = collect(self.body[i:i + 1] for i in range(len(self.body)))
+        self.assertEqual(items, json.loads(self.body))
+        self.assertEqual(stream.count, len(DOCUMENT))
+        self.assertEqual(stream.body_bytes, len(self.body))
+
+    def test_random_chunks(self):
+        rng = random.Random(7)
+        for compact in (False, True):
+            body = json.dumps(DOCUMENT, separators=(',', ':') if compact else None).encode('utf-8')
+            for _ in range(50):
+                sizes = [rng.randint(1, 40) for _ in range(len(body))]
+                _, items = collect(chunked(body, sizes))
+                self.assertEqual(items, json.loads(body))
+
+    def test_empty_array(self):
+        stream, items = collect([b' [ ', b' ] '])
+        self.assertEqual((items, stream.count, stream.is_array), ([], 0, True))
+
+    def test_non_array_body_is_decoded_whole(self):
+        body = json.dumps({'status': 'ok', 'items': [1, 2]}).encode('utf-8')
+        stream = stream_json_array(chunked(body, [3] * len(body)))
+        self.assertFalse(stream.is_array)
+        self.assertEqual(stream.value, json.loads(body))
+
+    def test_validation_and_sample(self):
+        body = json.dumps([{'id': i} for i in range(100)]).encode('utf-8')
+        stream = stream_json_array(
+            chunked(body, [17] * len(body)), validate=lambda item: 'odd' if item['id'] % 2 else None,
+            sample_size=5, max_invalid=3, seed=1
+        )
+        self.assertEqual(stream.count, 100)
+        self.assertEqual(stream.invalid, 50)
+        self.assertEqual([entry['index'] for entry in stream.invalid_items], [1, 3, 5])
+        self.assertEqual(len(stream.sample), 5)
+
+    def test_truncated_body_raises(self):
+        for cut in range(1, len(self.body)):
+            with self.subTest(cut=cut), self.assertRaises(ValueError):
+                collect(chunked(self.body[:cut], [5] * cut))
+
+    def test_invalid_body_raises(self):
+        for body in (
+            b'',
+            b'   ',
+            b'[1, 2,, 3]',
+            b'[1 2]',
+            b'[{"a": 1}, {"b": }]',
+            b'[1, 2] trailing',
+            b'[1, 2]]',
+            b'[tru]',
+            b'{"not": "closed"',
+            b'[1, "\xff"]'
+        ):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                collect(body[i:i + 1] for i in range(len(body)))
+
+    def test_item_larger_than_limit_raises(self):
+        stream = ArrayStream(max_item_bytes=64)
+        with self.assertRaises(ValueError):
+            stream.feed(b'["' + b'x' * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import math
+import random
+import statistics
+import unittest
+
+from harness.latency import SUB_BUCKET_BITS, LatencyHistogram, LatencyRecorder
+
+# A bucket is at most 1 / 2^(SUB_BUCKET_BITS - 1) of the values it holds wide
+RELATIVE_ERROR = 1 / (1 << (SUB_BUCKET_BITS - 1))
+
+
+def nearest_rank(values, pct):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def samples(self, seed=3, n=20000):
+        rng = random.Random(seed)
+        return [rng.lognormvariate(3, 1) for _ in range(n)]
+
+    def test_percentiles_within_bucket_error(self):
+        values = self.samples()
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        quantiles = statistics.quantiles(values, n=100, method='inclusive')
+        for pct in (1, 10, 50, 90, 99):
+            estimate = histogram.percentile(pct)
+            exact = nearest_rank(values, pct)
+            # The histogram reports its bucket's upper bound, never below the true value
+            self.assertGreaterEqual(estimate, round(exact, 3) - 0.001)
+            self.assertLessEqual(estimate, exact * (1 + RELATIVE_ERROR) + 0.001)
+            # statistics.quantiles interpolates, so it may sit one neighbouring sample away
+            self.assertAlmostEqual(estimate, quantiles[pct - 1], delta=quantiles[pct - 1] * 2 * RELATIVE_ERROR)
+
+    def test_merge_equals_recording_into_one_histogram(self):
+        values = self.samples(seed=8)
+        combined = LatencyHistogram()
+        parts = [LatencyHistogram() for _ in range(4)]
+        for i, value in enumerate(values):
+            combined.record(value)
+            parts[i % 4].record(value)
+        merged = LatencyHistogram()
+        for part in parts:
+            merged.merge(part)
+        self.assertEqual(merged.counts, combined.counts)
+        self.assertEqual(merged.to_dict(), combined.to_dict())
+
+    def test_merge_with_empty_histograms(self):
+        histogram = LatencyHistogram()
+        histogram.record(5.0)
+        histogram.merge(LatencyHistogram())
+        self.assertEqual(histogram.to_dict()['min_ms'], 5.0)
+        empty = LatencyHistogram().merge(histogram)
+        self.assertEqual(empty.to_dict(), histogram.to_dict())
+
+    def test_empty_histogram(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+        self.assertEqual(histogram.mean, 0.0)
+        self.assertEqual(histogram.to_dict(), {'count': 0})
+
+    def test_zero_and_negative_values(self):
+        histogram = LatencyHistogram()
+        histogram.record(0)
+        histogram.record(-3)
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.percentile(100), 0.0)
+        self.assertEqual(histogram.max, 0.0)
+
+    def test_small_values_are_exact(self):
+        # Below 2^SUB_BUCKET_BITS microseconds every value has its own bucket
+        histogram = LatencyHistogram()
+        for us in range(1 << SUB_BUCKET_BITS):
+            histogram.record(us / 1000)
+        self.assertEqual(histogram.percentile(50), 0.127)
+        self.assertEqual(histogram.max, 0.255)
+
+    def test_very_large_values(self):
+        histogram = LatencyHistogram()
+        for value in (3_600_000.0, 86_400_000.0, 1e9):
+            histogram.record(value)
+        self.assertEqual(histogram.max, 1e9)
+        self.assertEqual(histogram.percentile(100), 1e9)
+        estimate = histogram.percentile(50)
+        self.assertGreaterEqual(estimate, 86_400_000.0)
+        self.assertLessEqual(estimate, 86_400_000.0 * (1 + RELATIVE_ERROR))
+
+
+class LatencyRecorderTest(unittest.TestCase):
+
+    def test_merge_adds_histograms_and_errors(self):
+        first, second = LatencyRecorder(), LatencyRecorder()
+        first.record('GET /api/status', 'total', 10.0)
+        second.record('GET /api/status', 'total', 20.0)
+        second.record('POST /api/status', 'ttfb', 4.0)
+        second.record_error('POST /api/status')
+        first.merge(second.histograms, second.errors)
+        summary = first.summary()
+        self.assertEqual(summary['GET /api/status']['total']['count'], 2)
+        self.assertEqual(summary['POST /api/status']['ttfb']['count'], 1)
+        self.assertEqual(summary['POST /api/status']['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
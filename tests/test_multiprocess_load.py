@@ -0,0 +1,62 @@
+import unittest
+
+from harness.multiprocess_load import MultiProcessLoad, merge_connection_stats, split
+
+
+class SplitTest(unittest.TestCase):
+
+    def test_shares_add_up_and_differ_by_at_most_one(self):
+        for total in range(1, 40):
+            for parts in range(1, total + 1):
+                shares = split(total, parts)
+                with self.subTest(total=total, parts=parts):
+                    self.assertEqual(len(shares), parts)
+                    self.assertEqual(sum(shares), total)
+                    self.assertLessEqual(max(shares) - min(shares), 1)
+                    self.assertEqual(shares, sorted(shares, reverse=True))
+
+    def test_examples(self):
+        self.assertEqual(split(5, 3), [2, 2, 1])
+        self.assertEqual(split(6, 3), [2, 2, 2])
+        self.assertEqual(split(1, 1), [1])
+
+    def test_configs_use_every_worker_once(self):
+        load = MultiProcessLoad('http://127.0.0.1:1/api', duration=1, concurrency=7, processes=3)
+        configs = load._configs()
+        self.assertEqual([config['concurrency'] for config in configs], [3, 2, 2])
+        # Each process seeds its workers from its own range, so no two workers share a seed
+        self.assertEqual([config['seed'] for config in configs], [0, 3, 5])
+
+    def test_never_more_processes_than_workers(self):
+        load = MultiProcessLoad('http://127.0.0.1:1/api', duration=1, concurrency=2, processes=8)
+        self.assertEqual(len(load._configs()), 2)
+
+
+class MergeConnectionStatsTest(unittest.TestCase):
+
+    def test_sums_and_recomputes_reuse(self):
+        merged = merge_connection_stats([
+            {'hosts': 1, 'requests': 100, 'connections_opened': 4, 'connections_reused': 96, 'reuse_rate': 96.0},
+            {'hosts': 1, 'requests': 50, 'connections_opened': 6, 'connections_reused': 44, 'reuse_rate': 88.0}
+        ])
+        self.assertEqual(merged, {
+            'hosts': 2,
+            'requests': 150,
+            'connections_opened': 10,
+            'connections_reused': 140,
+            'reuse_rate': 140 / 150 * 100
+        })
+
+    def test_more_connections_than_requests(self):
+        merged = merge_connection_stats([{'hosts': 1, 'requests': 2, 'connections_opened': 3}])
+        self.assertEqual(merged['connections_reused'], 0)
+        self.assertEqual(merged['reuse_rate'], 0.0)
+
+    def test_no_requests(self):
+        merged = merge_connection_stats([])
+        self.assertEqual(merged['requests'], 0)
+        self.assertEqual(merged['reuse_rate'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from harness.perf_history import PerfHistory, check_against_history
+
+ENDPOINT = 'GET /api/status'
+
+
+class CheckAgainstHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(handle)
+        self.logged = []
+        os.environ.setdefault('GIT_COMMIT', 'test')
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def log_test(self, name, success, message, details=None):
+        self.logged.append((name, success))
+
+    def run_once(self, p50_ms, failed=0):
+        return check_against_history(
+            'api', {(ENDPOINT, 'total.p50_ms'): p50_ms}, 6, failed, self.log_test, path=self.path
+        )
+
+    def test_consecutive_slow_runs_are_all_flagged(self):
+        for i in range(10):
+            self.assertEqual(self.run_once(100.0 + (i % 3)), [])
+        first = self.run_once(180.0)
+        second = self.run_once(180.0)
+        self.assertEqual([r['metric'] for r in first], ['total.p50_ms'])
+        self.assertEqual([r['metric'] for r in second], ['total.p50_ms'])
+        self.assertEqual(self.logged, [(f"Performance Regression: {ENDPOINT}", False)] * 2)
+
+    def test_regressed_runs_are_stored_as_failed(self):
+        for _ in range(6):
+            self.run_once(100.0)
+        self.run_once(200.0)
+        history = PerfHistory(self.path)
+        try:
+            failed = [row[0] for row in history.db.execute("SELECT failed FROM runs ORDER BY id")]
+            self.assertEqual(failed, [0] * 6 + [1])
+            self.assertEqual(history.baseline('api', ENDPOINT, 'total.p50_ms'), [100.0] * 6)
+        finally:
+            history.close()
+
+    def test_no_verdict_before_enough_runs(self):
+        for _ in range(3):
+            self.run_once(100.0)
+        self.assertEqual(self.run_once(500.0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+
+from harness.replay import ReplayEngine, parse_capture_line
+
+
+class FakeResponse:
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.content = b'{}'
+
+
+class FakeSession:
+    """Answers 200, or raises a non-requests error for paths under /broken"""
+
+    def __init__(self):
+        self.sent = []
+
+    def request(self, method, url, **kwargs):
+        if '/broken' in url:
+            raise TypeError("cannot send")
+        self.sent.append((method, url))
+        return FakeResponse(200)
+
+
+class ParseCaptureLineTest(unittest.TestCase):
+
+    def test_valid_line(self):
+        entry = parse_capture_line('{"path": "/api/status", "ts": 1, "latency_ms": 12, "status": "200"}')
+        self.assertEqual(entry['ts'], 1.0)
+        self.assertEqual(entry['latency_ms'], 12.0)
+        self.assertEqual(entry['status'], 200)
+
+    def test_rejects_bad_numbers(self):
+        for line in (
+            '{"path": "/a", "latency_ms": NaN}',
+            '{"path": "/a", "latency_ms": Infinity}',
+            '{"path": "/a", "latency_ms": -1}',
+            '{"path": "/a", "latency_ms": "12"}',
+            '{"path": "/a", "ts": "soon"}',
+            '{"path": "/a", "ts": true}',
+            '{"path": "/a", "ts": NaN}'
+        ):
+            with self.subTest(line=line), self.assertRaises(ValueError):
+                parse_capture_line(line)
+
+
+class ReplayEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write_capture(self, lines):
+        with open(self.path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def test_invalid_lines_are_counted_and_the_replay_completes(self):
+        self.write_capture([
+            json.dumps({'path': '/api/status', 'ts': 0, 'latency_ms': 5}),
+            '{"path": "/api/status", "ts": 0, "latency_ms": NaN}',
+            '{"path": "/api/status", "ts": 0, "latency_ms": Infinity}',
+            json.dumps({'path': '/api/status', 'ts': 'later'}),
+            json.dumps({'path': '/api/status', 'ts': 0, 'latency_ms': 7})
+        ])
+        report = ReplayEngine(FakeSession(), 'http://localhost/api', speed=0, concurrency=2).run(self.path)
+        self.assertEqual(report['requests'], 2)
+        self.assertEqual(report['invalid_lines'], 3)
+        self.assertEqual(report['errors'], 0)
+        self.assertIn('recorded_p50_ms', report['routes']['GET /api/status'])
+
+    def test_a_failing_entry_counts_as_an_error(self):
+        # More failing entries than the queue holds: a worker that died on the
+        # first one would leave the reader blocked on put()
+        lines = [json.dumps({'path': '/broken', 'ts': 0}) for _ in range(20)]
+        lines.append(json.dumps({'path': '/api/status', 'ts': 0}))
+        self.write_capture(lines)
+        session = FakeSession()
+        report = ReplayEngine(session, 'http://localhost/api', speed=0, concurrency=1).run(self.path)
+        self.assertEqual(report['failed_sends'], 20)
+        self.assertEqual(report['errors'], 20)
+        self.assertEqual(report['requests'], 1)
+        self.assertEqual(len(session.sent), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from harness.soak import detect_drift
+
+
+def windows(p50s, docs_per_window=500):
+    return [
+        {'window': index, 'get_requests': 100, 'get_p50_ms': p50, 'collection_estimate': index * docs_per_window}
+        for index, p50 in enumerate(p50s)
+    ]
+
+
+class DetectDriftTest(unittest.TestCase):
+
+    def test_flat_series_does_not_drift(self):
+        result = detect_drift(windows([10.0 + (i % 3) * 0.2 for i in range(20)]))
+        self.assertFalse(result['drifted'])
+        self.assertIsNone(result['onset_window'])
+        self.assertAlmostEqual(result['baseline_ms'], 10.2)
+        self.assertLess(abs(result['ms_per_1000_docs']), 0.05)
+
+    def test_linear_growth_drifts(self):
+        series = windows([10.0 + 0.01 * i * 500 for i in range(20)])
+        result = detect_drift(series)
+        self.assertTrue(result['drifted'])
+        # Baseline is 15ms (window 1), the limit 22.5ms is first passed by window 3 at 25ms
+        self.assertEqual(result['baseline_ms'], 15.0)
+        self.assertEqual(result['limit_ms'], 22.5)
+        self.assertEqual(result['onset_window'], 3)
+        self.assertEqual(result['collection_at_onset'], 1500)
+        self.assertAlmostEqual(result['ms_per_1000_docs'], 10.0)
+        self.assertAlmostEqual(result['correlation'], 1.0)
+
+    def test_one_spike_does_not_drift(self):
+        p50s = [10.0] * 20
+        p50s[10] = 100.0
+        result = detect_drift(windows(p50s))
+        self.assertFalse(result['drifted'])
+        self.assertIsNone(result['collection_at_onset'])
+
+    def test_spikes_shorter_than_consecutive_do_not_drift(self):
+        p50s = [10.0] * 20
+        p50s[8] = p50s[9] = 40.0
+        self.assertFalse(detect_drift(windows(p50s))['drifted'])
+        p50s[10] = 40.0
+        self.assertEqual(detect_drift(windows(p50s))['onset_window'], 8)
+
+    def test_windows_without_gets_are_ignored(self):
+        series = windows([10.0] * 3 + [30.0] * 3)
+        series.insert(3, {'window': 99, 'get_requests': 0, 'get_p50_ms': None, 'collection_estimate': 0})
+        result = detect_drift(series)
+        self.assertTrue(result['drifted'])
+        self.assertEqual(result['onset_window'], 3)
+
+    def test_too_few_windows(self):
+        result = detect_drift(windows([10.0, 50.0, 90.0]))
+        self.assertFalse(result['drifted'])
+        self.assertIsNone(result['baseline_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import http.client
+import json
+import statistics
+import time
+import unittest
+
+from harness.standin import serve
+
+# Loopback round trips should stay in the low milliseconds; a delayed-ACK stall is ~40ms
+MAX_ROUND_TRIP_MS = 15
+
+
+class StandInServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = serve()
+        self.connection = http.client.HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=5)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def round_trip_ms(self, method, path, body=None):
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        start = time.perf_counter()
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        response.read()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.assertEqual(response.status, 200)
+        return elapsed
+
+    def test_loopback_round_trip_is_fast(self):
+        body = json.dumps({'client_name': 'latency'})
+        # The first requests open the connection and warm the handler
+        for _ in range(3):
+            self.round_trip_ms('POST', '/api/status', body)
+        posts = [self.round_trip_ms('POST', '/api/status', body) for _ in range(20)]
+        gets = [self.round_trip_ms('GET', '/api/status') for _ in range(20)]
+        self.assertLess(statistics.median(posts), MAX_ROUND_TRIP_MS)
+        self.assertLess(statistics.median(gets), MAX_ROUND_TRIP_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()